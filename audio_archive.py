@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Persisting recordings without blocking the dictation.
+
+The recorder hands the PCM array to the transcriber directly; the archived
+copy is written here in a background thread, optionally compressed.
+After transcription the WAV is transcoded to Opus/FLAC in the background and
+deleted once it is older than the retention period.
+
+USAGE (compress an existing archive):
+  python3 audio_archive.py --compress [recordings_dir] [--format opus|flac] [--keep-wav-days N] [--workers N]
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import soundfile as sf
+
+# name -> (soundfile format, subtype, file extension)
+ARCHIVE_FORMATS = {
+    "wav": ("WAV", "PCM_16", ".wav"),
+    "flac": ("FLAC", "PCM_16", ".flac"),
+    "opus": ("OGG", "OPUS", ".opus"),
+}
+
+COMPRESSED_FORMATS = ("flac", "opus")
+DAY_SECONDS = 24 * 3600
+EXPIRY_MARKER = ".wav_expiry"  # last day folder already swept by expire_new_days()
+
+_pending = []
+_pending_lock = threading.Lock()
+
+
+def _track(thread):
+    """Remember a background thread for wait_for_pending_saves(), forgetting finished ones."""
+    with _pending_lock:
+        _pending[:] = [t for t in _pending if t.is_alive()]
+        _pending.append(thread)
+
+
+def audio_filename(fmt):
+    return "audio" + ARCHIVE_FORMATS[fmt][2]
+
+
+def save_audio(audio, path, sample_rate, fmt="wav"):
+    """Write `audio` to `path` atomically (readers never see a half-written file)."""
+    container, subtype, _ = ARCHIVE_FORMATS[fmt]
+    tmp_path = path + ".part"
+    sf.write(tmp_path, audio, sample_rate, format=container, subtype=subtype)
+    os.replace(tmp_path, path)
+
+
+def save_audio_async(audio, path, sample_rate, fmt="wav", on_saved=None):
+    """Write the recording in a background (non-daemon) thread and return it.
+    on_saved(start, seconds) is called after a successful write."""
+    def _save():
+        try:
+            start = time.time()
+            save_audio(audio, path, sample_rate, fmt)
+            if on_saved:
+                on_saved(start, time.time() - start)
+        except Exception as e:
+            print(f"\n⚠️ Could not save audio to {path}: {e}")
+
+    thread = threading.Thread(target=_save, name="audio-archive")
+    thread.start()
+    _track(thread)
+    return thread
+
+
+def find_recording_audio(folder):
+    """Audio file of a recording folder, preferring the lossless copies (None if there is none)."""
+    for fmt in ("wav",) + COMPRESSED_FORMATS:
+        path = os.path.join(folder, audio_filename(fmt))
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def compressed_copy(folder):
+    for fmt in COMPRESSED_FORMATS:
+        path = os.path.join(folder, audio_filename(fmt))
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def transcode(src, fmt):
+    """Write a `fmt` copy of `src` next to it (atomically) and return its path."""
+    audio, sample_rate = sf.read(src, dtype="float32")
+    dst = os.path.join(os.path.dirname(src), audio_filename(fmt))
+    save_audio(audio, dst, sample_rate, fmt)
+    return dst
+
+
+def archive_recording(folder, fmt="opus", keep_wav_days=0):
+    """
+    Make sure the recording in `folder` has a compressed copy, then delete its WAV if it
+    is at least keep_wav_days old (never, if None). Returns (transcoded, bytes_freed).
+    """
+    wav = os.path.join(folder, audio_filename("wav"))
+    if not os.path.exists(wav):
+        return False, 0
+    transcoded = False
+    if compressed_copy(folder) is None:
+        transcode(wav, fmt)
+        transcoded = True
+    if keep_wav_days is None or time.time() - os.path.getmtime(wav) < keep_wav_days * DAY_SECONDS:
+        return transcoded, 0
+    size = os.path.getsize(wav)
+    os.remove(wav)
+    return transcoded, size
+
+
+def archive_recording_async(folder, fmt="opus", keep_wav_days=0, expire_root=None):
+    """Compress a fresh recording in a background thread, once its WAV has been written.
+    With expire_root, the same thread then expires the WAVs of days that crossed the
+    retention period since the last sweep (see expire_new_days)."""
+    def _archive():
+        with _pending_lock:
+            pending = list(_pending)
+        for thread in pending:
+            if thread is not threading.current_thread():
+                thread.join()  # the WAV itself may still be being written
+        try:
+            archive_recording(folder, fmt, keep_wav_days)
+        except Exception as e:
+            print(f"\n⚠️ Could not compress the recording in {folder}: {e}")
+        if expire_root and keep_wav_days:
+            try:
+                expire_new_days(expire_root, keep_wav_days)
+            except OSError as e:
+                print(f"\n⚠️ Could not expire old WAVs under {expire_root}: {e}")
+
+    thread = threading.Thread(target=_archive, name="audio-compress")
+    _track(thread)
+    thread.start()
+    return thread
+
+
+def expire_wavs(root, keep_wav_days, after_day=None):
+    """Delete WAVs older than keep_wav_days that already have a compressed copy. Returns bytes freed.
+    Day folders up to after_day (YYYY-MM-DD) are skipped."""
+    if keep_wav_days is None:
+        return 0
+    cutoff = time.time() - keep_wav_days * DAY_SECONDS
+    cutoff_day = time.strftime("%Y-%m-%d", time.localtime(cutoff))
+    freed = 0
+    for day in os.scandir(root):
+        # Day folders are named YYYY-MM-DD: recent days are skipped without being opened
+        if not day.is_dir() or day.name > cutoff_day or (after_day and day.name <= after_day):
+            continue
+        for entry in os.scandir(day.path):
+            wav = os.path.join(entry.path, audio_filename("wav"))
+            if (entry.is_dir() and os.path.exists(wav) and compressed_copy(entry.path)
+                    and os.path.getmtime(wav) < cutoff):
+                freed += os.path.getsize(wav)
+                os.remove(wav)
+    return freed
+
+
+def wav_folders(root):
+    """Recording folders under root (recordings/<day>/<time>) that still hold a WAV."""
+    folders = []
+    for day in os.scandir(root):
+        if not day.is_dir():
+            continue
+        for entry in os.scandir(day.path):
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, audio_filename("wav"))):
+                folders.append(entry.path)
+    return sorted(folders)
+
+
+def archive_tree(root, fmt="opus", keep_wav_days=0, workers=None):
+    """Apply the archival policy to every recording under root, transcoding in parallel processes.
+    Returns (folders, transcoded, bytes_freed, failures)."""
+    folders = wav_folders(root)
+    transcoded = freed = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [(folder, pool.submit(archive_recording, folder, fmt, keep_wav_days)) for folder in folders]
+        for i, (folder, future) in enumerate(futures):
+            try:
+                done, size = future.result()
+            except Exception as e:
+                failures.append((folder, e))
+                print(f"[{i + 1}/{len(folders)}] ❌ {folder}: {e}")
+                continue
+            transcoded += done
+            freed += size
+            if done or size:
+                print(f"[{i + 1}/{len(folders)}] ✅ {folder}" + (" (WAV deleted)" if size else ""))
+    return len(folders), transcoded, freed, failures
+
+
+def expire_new_days(root, keep_wav_days):
+    """expire_wavs() limited to the day folders that fully crossed the retention period since
+    the previous call (recorded in root/EXPIRY_MARKER): a no-op on all but one save a day.
+    The first call sweeps the whole archive once. Returns bytes freed."""
+    if not keep_wav_days:
+        return 0
+    cutoff = time.time() - keep_wav_days * DAY_SECONDS
+    last_full_day = (date.fromtimestamp(cutoff) - timedelta(days=1)).isoformat()
+    marker = os.path.join(root, EXPIRY_MARKER)
+    try:
+        with open(marker) as f:
+            swept = f.read().strip() or None
+    except FileNotFoundError:
+        swept = None
+    if swept is not None and swept >= last_full_day:
+        return 0
+    freed = expire_wavs(root, keep_wav_days, after_day=swept)
+    with open(marker, "w") as f:
+        f.write(last_full_day)
+    return freed
+
+
+def wait_for_pending_saves():
+    """Block until every background save or transcode has finished (before moving or deleting folders)."""
+    while True:
+        with _pending_lock:
+            if not _pending:
+                return
+            thread = _pending.pop()
+        thread.join()
+
+
+def main():
+    args = sys.argv[1:]
+    if "--compress" not in args:
+        print(__doc__)
+        return
+    args.remove("--compress")
+    options = {}
+    for flag in ("--format", "--keep-wav-days", "--workers"):
+        if flag in args:
+            idx = args.index(flag)
+            options[flag] = args[idx + 1]
+            del args[idx:idx + 2]
+    root = args[0] if args else "recordings"
+    fmt = options.get("--format", "opus")
+    if fmt not in COMPRESSED_FORMATS:
+        print(f"❌ Unsupported format: {fmt} (use {' or '.join(COMPRESSED_FORMATS)})")
+        return
+    keep_wav_days = float(options["--keep-wav-days"]) if "--keep-wav-days" in options else None
+    workers = int(options["--workers"]) if "--workers" in options else None
+
+    start = time.time()
+    total, transcoded, freed, failures = archive_tree(root, fmt, keep_wav_days, workers)
+    print("\n📊 Archive stats:")
+    print(f" - Recordings with WAV  : {total}")
+    print(f" - Transcoded           : {transcoded} (to {fmt})")
+    print(f" - WAV space freed      : {freed / 1e6:.1f} MB")
+    print(f" - Failures             : {len(failures)}")
+    print(f" - Wall time            : {time.time() - start:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+In-process decode + preprocessing of imported audio (voice messages, podcasts...).
+
+Files are decoded straight to 16 kHz mono float32 (what Whisper consumes), then:
+  1. optional high-pass filter (removes rumble / handling noise below the cutoff)
+  2. loudness normalization to TARGET_DBFS, measured on non-silent frames only,
+     with the gain capped so quiet noise is not blown up and peaks never clip
+Both steps are vectorized NumPy. The result feeds the model directly: no
+intermediate WAV and no ffmpeg process per file.
+
+USAGE (replacement for audio_to_wav.sh / mp3_to_wav.sh):
+  python3 audio_preprocess.py voice_message.ogg            # -> voice_message.wav (16 kHz mono)
+  python3 audio_preprocess.py ~/Downloads/ --workers 8     # Every supported file of a folder
+  python3 audio_preprocess.py <file|dir> --highpass 80     # Also cut everything below 80 Hz
+  python3 audio_preprocess.py <file|dir> --no-normalize    # Keep the original level
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+TARGET_DBFS = -20.0  # RMS level of the speech after normalization
+GATE_DBFS = -50.0  # frames quieter than this are ignored when measuring loudness
+MAX_GAIN_DB = 30.0
+PEAK_CEILING = 0.98  # the gain never pushes a sample above this
+FRAME_SEC = 0.05  # loudness is measured on 50 ms frames
+HIGHPASS_TAPS = 1023  # linear-phase FIR length (odd): ~60 Hz transition band at 16 kHz
+FFT_BLOCK = 1 << 16  # samples per FFT block of the overlap-add convolution
+CONVERT_EXTENSIONS = {'.mp3', '.ogg', '.m4a', '.flac', '.opus'}  # plus .wav when given a single file
+
+
+def highpass_kernel(sample_rate, cutoff_hz, taps=HIGHPASS_TAPS):
+    """Windowed-sinc high-pass FIR (spectral inversion of a Blackman low-pass)."""
+    n = np.arange(taps) - (taps - 1) / 2
+    lowpass = np.sinc(2 * cutoff_hz / sample_rate * n) * np.blackman(taps)
+    lowpass /= lowpass.sum()
+    kernel = -lowpass
+    kernel[(taps - 1) // 2] += 1.0
+    return kernel
+
+
+def highpass(audio, sample_rate, cutoff_hz, taps=HIGHPASS_TAPS):
+    """Zero-delay FIR high-pass via blockwise FFT overlap-add (memory stays bounded on long files)."""
+    if len(audio) == 0:
+        return audio
+    kernel = highpass_kernel(sample_rate, cutoff_hz, taps)
+    fft_size = 1 << int(np.ceil(np.log2(FFT_BLOCK + taps - 1)))
+    kernel_fft = np.fft.rfft(kernel, fft_size)
+    out = np.zeros(len(audio) + taps - 1, dtype=np.float64)
+    for start in range(0, len(audio), FFT_BLOCK):
+        block = audio[start:start + FFT_BLOCK]
+        filtered = np.fft.irfft(np.fft.rfft(block, fft_size) * kernel_fft, fft_size)
+        out[start:start + len(block) + taps - 1] += filtered[:len(block) + taps - 1]
+    delay = (taps - 1) // 2  # linear phase: shift back by half the kernel
+    return out[delay:delay + len(audio)].astype(np.float32)
+
+
+def loudness_gain(audio, sample_rate, target_dbfs=TARGET_DBFS):
+    """Linear gain that brings the non-silent frames to target_dbfs (1.0 for silence)."""
+    frame = max(1, int(sample_rate * FRAME_SEC))
+    usable = len(audio) // frame * frame
+    if usable == 0:
+        return 1.0
+    power = np.mean(np.square(audio[:usable].reshape(-1, frame), dtype=np.float64), axis=1)
+    active = power[power > 10 ** (GATE_DBFS / 10)]
+    if len(active) == 0:
+        return 1.0
+    level_db = 10 * np.log10(np.mean(active))
+    gain = 10 ** (min(target_dbfs - level_db, MAX_GAIN_DB) / 20)
+    peak = float(np.max(np.abs(audio)))
+    if peak * gain > PEAK_CEILING:
+        gain = PEAK_CEILING / peak
+    return gain
+
+
+def preprocess(audio, sample_rate=SAMPLE_RATE, normalize=True, highpass_hz=None):
+    """Apply the optional high-pass, then loudness normalization, to a mono float32 array."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if highpass_hz:
+        audio = highpass(audio, sample_rate, highpass_hz)
+    if normalize:
+        gain = loudness_gain(audio, sample_rate)
+        if gain != 1.0:
+            audio = audio * np.float32(gain)
+    return audio
+
+
+def load_audio(path, sample_rate=SAMPLE_RATE, normalize=True, highpass_hz=None):
+    """Decode any supported file to preprocessed mono float32 at sample_rate."""
+    from faster_whisper.audio import decode_audio  # PyAV: decodes and resamples in-process
+
+    return preprocess(decode_audio(path, sampling_rate=sample_rate), sample_rate, normalize, highpass_hz)
+
+
+# === Conversion (replaces audio_to_wav.sh / mp3_to_wav.sh) ===
+
+def output_path_for(path):
+    base, ext = os.path.splitext(path)
+    # A .wav input is rewritten next to itself rather than over itself
+    return f"{base}.16k.wav" if ext.lower() == ".wav" else f"{base}.wav"
+
+
+def convert_file(path, sample_rate=SAMPLE_RATE, normalize=True, highpass_hz=None):
+    """Write the preprocessed 16 kHz mono PCM WAV next to `path`. Runs in a worker process.
+    Returns (output path, duration in seconds)."""
+    import soundfile as sf
+
+    audio = load_audio(path, sample_rate, normalize, highpass_hz)
+    output = output_path_for(path)
+    tmp_path = output + ".part"
+    sf.write(tmp_path, audio, sample_rate, subtype="PCM_16", format="WAV")
+    os.replace(tmp_path, output)
+    return output, len(audio) / sample_rate
+
+
+def convert_all(paths, workers=None, normalize=True, highpass_hz=None):
+    """Convert `paths` in a process pool. Returns (created paths, [(path, error)])."""
+    convert = partial(convert_file, normalize=normalize, highpass_hz=highpass_hz)
+    created, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for path, future in [(path, pool.submit(convert, path)) for path in paths]:
+            try:
+                output, duration = future.result()
+            except Exception as e:
+                failures.append((path, e))
+                print(f"❌ {path}: {e}")
+                continue
+            created.append(output)
+            print(f"✅ {path} -> {output} ({duration:.1f}s)")
+    return created, failures
+
+
+def main():
+    from batch_transcriber import discover_audio_files
+
+    args = sys.argv[1:]
+    options = {}
+    for flag in ("--workers", "--highpass"):
+        if flag in args:
+            idx = args.index(flag)
+            options[flag] = args[idx + 1]
+            del args[idx:idx + 2]
+    normalize = "--no-normalize" not in args
+    args = [a for a in args if a != "--no-normalize"]
+    if len(args) != 1 or args[0] in ["--help", "-h"]:
+        print(__doc__)
+        return 1
+    target = args[0]
+    if os.path.isfile(target):
+        if os.path.splitext(target)[1].lower() not in CONVERT_EXTENSIONS | {".wav"}:
+            print(f"❌ Unsupported format: {target}")
+            print(f"   Supported: {', '.join(sorted(CONVERT_EXTENSIONS))}")
+            return 1
+        paths = [target]
+    else:
+        paths = discover_audio_files(target, CONVERT_EXTENSIONS)
+        if not paths:
+            print(f"❌ No supported audio files found in: {target}")
+            return 1
+    start = time.time()
+    created, failures = convert_all(paths, int(options["--workers"]) if "--workers" in options else None,
+                                    normalize, float(options["--highpass"]) if "--highpass" in options else None)
+    print(f"\n📊 Converted {len(created)}/{len(paths)} files in {time.time() - start:.1f}s")
+    if failures:
+        print(f"⚠️ {len(failures)} file(s) failed to convert.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+In-process audio duration probing (no ffprobe process spawn).
+
+Order of attempts:
+  1. libsndfile headers via soundfile (WAV, FLAC, OGG Vorbis, Opus and MP3 on recent builds)
+  2. Header parsing: MP3 (Xing/Info/VBRI or CBR estimate), M4A/MP4 (mvhd atom), Ogg Opus (last granule)
+  3. ffprobe, only if everything above failed
+"""
+
+import os
+import struct
+import subprocess
+
+import soundfile as sf
+
+MP3_BITRATES_KBPS = {
+    "mpeg1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "mpeg2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {
+    "mpeg1": [44100, 48000, 32000],
+    "mpeg2": [22050, 24000, 16000],
+    "mpeg2.5": [11025, 12000, 8000],
+}
+MP3_SYNC_SEARCH_BYTES = 64 * 1024
+OGG_TAIL_BYTES = 64 * 1024
+
+
+def _skip_id3v2(f):
+    """Return the offset of the first byte after an ID3v2 tag (0 if none)."""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def mp3_duration(path):
+    """Duration of an MPEG-1/2/2.5 Layer III file from its first frame header, or None."""
+    with open(path, "rb") as f:
+        audio_start = _skip_id3v2(f)
+        f.seek(audio_start)
+        data = f.read(MP3_SYNC_SEARCH_BYTES)
+    file_size = os.path.getsize(path)
+
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            continue
+        header = struct.unpack(">I", data[i:i + 4])[0]
+        version_bits = (header >> 19) & 0x3
+        layer_bits = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        if version_bits == 1 or layer_bits != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue  # reserved values or not Layer III: keep scanning
+        version = {3: "mpeg1", 2: "mpeg2", 0: "mpeg2.5"}[version_bits]
+        mono = ((header >> 6) & 0x3) == 3
+        sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+        samples_per_frame = 1152 if version == "mpeg1" else 576
+        bitrate = MP3_BITRATES_KBPS["mpeg1" if version == "mpeg1" else "mpeg2"][bitrate_index] * 1000
+
+        # VBR files carry the total frame count in a Xing/Info or VBRI header
+        if version == "mpeg1":
+            side_info = 17 if mono else 32
+        else:
+            side_info = 9 if mono else 17
+        xing = i + 4 + side_info
+        if data[xing:xing + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+            if flags & 0x1:
+                frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+                return frames * samples_per_frame / sample_rate
+        vbri = i + 4 + 32
+        if data[vbri:vbri + 4] == b"VBRI":
+            frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+            return frames * samples_per_frame / sample_rate
+        # Constant bitrate: estimate from the audio payload size
+        return (file_size - audio_start - i) * 8 / bitrate
+    return None
+
+
+def _iter_atoms(f, start, end):
+    """Yield (type, payload_start, payload_end) for MP4 atoms between start and end."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def mp4_duration(path):
+    """Duration of an M4A/MP4 file from its movie header (mvhd), or None."""
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        for kind, start, end in _iter_atoms(f, 0, file_size):
+            if kind != b"moov":
+                continue
+            for sub_kind, sub_start, _ in _iter_atoms(f, start, end):
+                if sub_kind != b"mvhd":
+                    continue
+                f.seek(sub_start)
+                version = f.read(4)[0]
+                if version == 1:
+                    _, _, timescale, duration = struct.unpack(">QQIQ", f.read(28))
+                else:
+                    _, _, timescale, duration = struct.unpack(">IIII", f.read(16))
+                return duration / timescale if timescale else None
+    return None
+
+
+def opus_duration(path):
+    """Duration of an Ogg Opus file from the last page's granule position, or None."""
+    with open(path, "rb") as f:
+        head = f.read(OGG_TAIL_BYTES)
+        marker = head.find(b"OpusHead")
+        if not head.startswith(b"OggS") or marker < 0:
+            return None
+        pre_skip = struct.unpack("<H", head[marker + 10:marker + 12])[0]
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - OGG_TAIL_BYTES))
+        tail = f.read()
+    last_page = tail.rfind(b"OggS")
+    if last_page < 0 or last_page + 14 > len(tail):
+        return None
+    granule = struct.unpack("<q", tail[last_page + 6:last_page + 14])[0]
+    return max(0, granule - pre_skip) / 48000  # Opus granules always count 48 kHz samples
+
+
+HEADER_PARSERS = {
+    ".mp3": mp3_duration,
+    ".m4a": mp4_duration,
+    ".mp4": mp4_duration,
+    ".opus": opus_duration,
+    ".ogg": opus_duration,
+}
+
+
+def ffprobe_duration(path):
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', path],
+            capture_output=True, text=True
+        )
+        return float(result.stdout.strip())
+    except (ValueError, FileNotFoundError):
+        return None
+
+
+def probe_duration(path):
+    """Return the duration of `path` in seconds, or None if it cannot be determined."""
+    try:
+        info = sf.info(path)
+        if info.frames > 0 and info.samplerate > 0:
+            return info.frames / info.samplerate
+    except Exception:
+        pass
+    parser = HEADER_PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser:
+        try:
+            duration = parser(path)
+            if duration:
+                return duration
+        except (OSError, struct.error, IndexError):
+            pass
+    return ffprobe_duration(path)
@@ -0,0 +1,126 @@
+"""
+Batch transcription of many audio files (e.g. a folder of WhatsApp voice messages).
+
+Files are decoded to 16 kHz mono (and loudness-normalized) in a process pool while one shared model
+transcribes them (optionally several CPU replicas in parallel threads).
+Each transcript is written next to its audio file as <name>.txt
+(plus <name>.jsonl with segment timestamps when asked for).
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from segment_output import write_jsonl
+
+
+def discover_audio_files(target, extensions):
+    """Return the sorted audio files in a directory (non-recursive) or matching a glob."""
+    if os.path.isdir(target):
+        candidates = [os.path.join(target, name) for name in os.listdir(target)]
+    else:
+        candidates = glob.glob(target, recursive=True)
+    return sorted(
+        path for path in candidates
+        if os.path.isfile(path) and os.path.splitext(path)[1].lower() in extensions
+    )
+
+
+def decode_file(path, sample_rate, normalize=True, highpass_hz=None):
+    """Decode and preprocess any supported file to a mono float32 array. Runs in a worker process."""
+    from audio_preprocess import load_audio
+
+    return load_audio(path, sample_rate, normalize, highpass_hz)
+
+
+def _decoded_in_order(paths, sample_rate, workers, normalize=True, highpass_hz=None):
+    """Yield (path, audio_or_exception) while keeping at most 2*workers decodes in flight."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        remaining = iter(paths)
+        decode = partial(decode_file, sample_rate=sample_rate, normalize=normalize, highpass_hz=highpass_hz)
+        for path in remaining:
+            pending.append((path, pool.submit(decode, path)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            path, future = pending.pop(0)
+            try:
+                yield path, future.result()
+            except Exception as e:
+                yield path, e
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(decode, next_path)))
+
+
+def transcript_path_for(audio_path):
+    return os.path.splitext(audio_path)[0] + ".txt"
+
+
+def run_batch(paths, transcribe_fn, sample_rate, workers=None, replicas=1, jsonl=False, normalize=True,
+              highpass_hz=None):
+    """
+    Transcribe `paths` with `transcribe_fn(audio) -> (segments, info)`.
+    Decoding and preprocessing (see audio_preprocess.py) run in `workers` processes;
+    `replicas` threads call transcribe_fn
+    concurrently (the model must have been loaded with num_workers=replicas).
+    Returns a list of (path, error) for files that failed.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = len(paths)
+    failures = []
+    audio_seconds = 0.0
+    done = 0
+    batch_start = time.time()
+
+    def _transcribe_one(path, audio):
+        start = time.time()
+        segments, _ = transcribe_fn(audio)
+        segments = list(segments)
+        text = " ".join(seg.text for seg in segments)
+        with open(transcript_path_for(path), "w") as f:
+            f.write(text)
+        if jsonl:
+            write_jsonl(os.path.splitext(path)[0] + ".jsonl", segments)
+        return len(audio) / sample_rate, time.time() - start
+
+    def _report(path, future):
+        nonlocal audio_seconds, done
+        done += 1
+        try:
+            duration, elapsed = future.result()
+        except Exception as e:
+            failures.append((path, e))
+            print(f"[{done}/{total}] ❌ {os.path.basename(path)}: {e}")
+            return
+        audio_seconds += duration
+        rtf = elapsed / duration if duration > 0 else 0
+        print(f"[{done}/{total}] ✅ {os.path.basename(path)} ({duration:.1f}s audio, RTF {rtf:.2f}x)")
+
+    with ThreadPoolExecutor(max_workers=replicas) as transcribers:
+        in_flight = []
+        for path, audio in _decoded_in_order(paths, sample_rate, workers, normalize, highpass_hz):
+            if isinstance(audio, Exception):
+                done += 1
+                failures.append((path, audio))
+                print(f"[{done}/{total}] ❌ {os.path.basename(path)}: decode failed: {audio}")
+                continue
+            in_flight.append((path, transcribers.submit(_transcribe_one, path, audio)))
+            # Keep the decode pipeline from racing far ahead of the model
+            while len(in_flight) >= replicas:
+                _report(*in_flight.pop(0))
+        for path, future in in_flight:
+            _report(path, future)
+
+    wall = time.time() - batch_start
+    print("\n📊 Batch stats:")
+    print(f" - Files transcribed    : {total - len(failures)}/{total}")
+    print(f" - Audio transcribed    : {audio_seconds:.1f} seconds")
+    print(f" - Wall time            : {wall:.1f} seconds")
+    print(f" - Throughput           : {audio_seconds / wall if wall > 0 else 0:.1f}x real time")
+    print(f" - Decode workers       : {workers}")
+    print(f" - Model replicas       : {replicas}")
+    return failures
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Reproducible Whisper benchmark over a directory of reference clips.
+
+Each clip is an audio file with a ground-truth transcript next to it
+(`clip.wav` + `clip.txt`). Every model runs in a fresh process so load time
+is a true cold load and peak RSS is per model; configs that only change
+beam_size/best_of reuse the loaded model.
+
+USAGE:
+  python3 benchmark_suite.py <clips_dir>
+  python3 benchmark_suite.py <clips_dir> --configs tiny:int8:1:1,base:int8:5:5 --repeats 3
+  python3 benchmark_suite.py <clips_dir> --json results.json --csv results.csv
+
+Reported per config: load time, cold RTF (first decode), warm RTF (median of the
+repeats), WER/CER against the references, and peak RSS of the worker process.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from inference_profile import select_profile, supported_compute_types
+from model_registry import ModelRegistry, group_configs
+from text_metrics import cer, wer
+
+SUPPORTED_AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.m4a', '.flac', '.opus'}
+SAMPLE_RATE = 16000
+
+# (model_size, compute_type, beam_size, best_of)
+GPU_CONFIGS = [
+    ("medium", "float16", 5, 5),
+    ("medium", "float16", 1, 1),
+    ("small", "int8", 1, 1),
+    ("base", "int8", 1, 1),
+    ("tiny", "int8", 1, 1),
+]
+CPU_CONFIGS = [
+    ("base", "int8", 5, 5),
+    ("base", "int8", 1, 1),
+    ("tiny", "int8", 5, 5),
+    ("tiny", "int8", 1, 1),
+]
+
+
+def discover_clips(clips_dir):
+    """Return [(audio_path, reference_text)] for every audio file that has a .txt reference."""
+    clips = []
+    for name in sorted(os.listdir(clips_dir)):
+        base, ext = os.path.splitext(name)
+        reference_path = os.path.join(clips_dir, base + ".txt")
+        if ext.lower() in SUPPORTED_AUDIO_EXTENSIONS and os.path.isfile(reference_path):
+            with open(reference_path) as f:
+                clips.append((os.path.join(clips_dir, name), f.read().strip()))
+    return clips
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_model_configs(configs, clips, device, cpu_threads, repeats):
+    """Benchmark configs sharing one model in the current (fresh) process. Returns result dicts."""
+    from faster_whisper.audio import decode_audio
+
+    audio = [(path, decode_audio(path, sampling_rate=SAMPLE_RATE), ref) for path, ref in clips]
+    registry = ModelRegistry(device, cpu_threads=cpu_threads)
+    return [run_config(registry, config, audio, repeats) for config in configs]
+
+
+def run_config(registry, config, audio, repeats):
+    """Benchmark one config on decoded clips. Returns a result dict."""
+    model_size, compute_type, beam_size, best_of = config
+    model, load_time, _ = registry.get(model_size, compute_type)
+
+    total_audio = sum(len(samples) for _, samples, _ in audio) / SAMPLE_RATE
+    cold_time = 0.0
+    warm_times = []
+    clip_results = []
+    for path, samples, reference in audio:
+        runs = []
+        text = ""
+        for _ in range(max(1, repeats)):
+            start = time.perf_counter()
+            segments, _ = model.transcribe(samples, beam_size=beam_size, best_of=best_of)
+            text = " ".join(seg.text for seg in segments).strip()
+            runs.append(time.perf_counter() - start)
+        cold_time += runs[0]
+        warm_times.append(statistics.median(runs[1:]) if len(runs) > 1 else runs[0])
+        clip_results.append({
+            "clip": os.path.basename(path),
+            "duration": len(samples) / SAMPLE_RATE,
+            "wer": wer(reference, text),
+            "cer": cer(reference, text),
+            "text": text,
+        })
+
+    ref_words = [len(ref.split()) for _, _, ref in audio]
+    ref_chars = [len(ref) for _, _, ref in audio]
+    return {
+        "model": model_size,
+        "compute": compute_type,
+        "beam": beam_size,
+        "best_of": best_of,
+        "load_time": load_time,
+        "audio_seconds": total_audio,
+        "cold_rtf": cold_time / total_audio if total_audio else 0,
+        "warm_rtf": sum(warm_times) / total_audio if total_audio else 0,
+        # Corpus-level rates: clips weighted by their reference length
+        "wer": sum(c["wer"] * w for c, w in zip(clip_results, ref_words)) / max(1, sum(ref_words)),
+        "cer": sum(c["cer"] * n for c, n in zip(clip_results, ref_chars)) / max(1, sum(ref_chars)),
+        "peak_rss_mb": peak_rss_mb(),
+        "clips": clip_results,
+    }
+
+
+def parse_configs(spec):
+    configs = []
+    for item in spec.split(","):
+        model_size, compute_type, beam_size, best_of = item.split(":")
+        configs.append((model_size, compute_type, int(beam_size), int(best_of)))
+    return configs
+
+
+def pop_option(args, flag, default=None):
+    if flag not in args:
+        return default
+    idx = args.index(flag)
+    value = args[idx + 1] if idx + 1 < len(args) else default
+    del args[idx:idx + 2]
+    return value
+
+
+def write_csv(path, results):
+    fields = ["model", "compute", "beam", "best_of", "load_time", "audio_seconds",
+              "cold_rtf", "warm_rtf", "wer", "cer", "peak_rss_mb"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    args = sys.argv[1:]
+    configs_spec = pop_option(args, "--configs")
+    repeats = int(pop_option(args, "--repeats", "2"))
+    json_path = pop_option(args, "--json")
+    csv_path = pop_option(args, "--csv")
+    if len(args) != 1 or args[0] in ["--help", "-h"]:
+        print(__doc__)
+        return
+
+    clips = discover_clips(args[0])
+    if not clips:
+        print(f"❌ No clips with .txt references found in {args[0]}")
+        return
+
+    profile = select_profile()
+    device = profile["device"]
+    configs = parse_configs(configs_spec) if configs_spec else (GPU_CONFIGS if device == "cuda" else CPU_CONFIGS)
+    supported = supported_compute_types(device)
+    configs = [c for c in configs if not supported or c[1] in supported]
+
+    print(f"Benchmarking {len(configs)} configs on {len(clips)} clips ({device}, {repeats} runs per clip)")
+    print("=" * 80)
+
+    results = []
+    groups = {}
+    for config in group_configs(configs):
+        groups.setdefault(config[:2], []).append(config)
+    # spawn: each model gets a clean process (cold load, independent peak RSS)
+    context = multiprocessing.get_context("spawn")
+    for i, ((model_size, compute_type), group) in enumerate(groups.items()):
+        print(f"[{i + 1}/{len(groups)}] {model_size}/{compute_type} ({len(group)} configs)...", end=" ", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                group_results = pool.submit(run_model_configs, group, clips, device,
+                                            profile["cpu_threads"], repeats).result()
+            except Exception as e:
+                print(f"ERROR: {e}")
+                continue
+        results.extend(group_results)
+        print("done")
+        for r in group_results:
+            print(f"    beam={r['beam']}/best_of={r['best_of']}: warm RTF {r['warm_rtf']:.3f}x, "
+                  f"WER {r['wer'] * 100:.1f}%")
+
+    print("\n" + "=" * 80)
+    print(f"{'Config':<32} {'Load':>6} {'Cold':>7} {'Warm':>7} {'WER':>6} {'CER':>6} {'RSS MB':>7}")
+    print("-" * 80)
+    for r in results:
+        name = f"{r['model']}/{r['compute']}/beam={r['beam']}"
+        print(f"{name:<32} {r['load_time']:>5.2f}s {r['cold_rtf']:>6.3f}x {r['warm_rtf']:>6.3f}x "
+              f"{r['wer'] * 100:>5.1f}% {r['cer'] * 100:>5.1f}% {r['peak_rss_mb']:>7.0f}")
+
+    metadata = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "device": device,
+        "cpu_threads": profile["cpu_threads"],
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "clips_dir": os.path.abspath(args[0]),
+        "repeats": repeats,
+    }
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"metadata": metadata, "results": results}, f, indent=2)
+        print(f"\n💾 JSON written to {json_path}")
+    if csv_path:
+        write_csv(csv_path, results)
+        print(f"💾 CSV written to {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
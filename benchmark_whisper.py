@@ -5,12 +5,14 @@ Benchmark different Whisper configurations to find the best speed/quality tradeo
 
 import time
 import sys
-from faster_whisper import WhisperModel
+from inference_profile import select_profile, supported_compute_types
+from model_registry import ModelRegistry, group_configs
 
 # Test file - use the most recent recording or pass as argument
 DEFAULT_TEST_FILE = "recordings/2026-01-31/14-58-08/audio.wav"
 
-DEVICE = "cuda"
+PROFILE = select_profile()
+DEVICE = PROFILE["device"]
 
 # Configurations to test
 CONFIGS = [
@@ -28,23 +30,24 @@ CONFIGS = [
 ]
 
 
-def benchmark_config(test_file, model_size, compute_type, beam_size, best_of):
+def benchmark_config(registry, test_file, model_size, compute_type, beam_size, best_of):
     """Run a single benchmark configuration."""
 
-    # Measure model loading time
-    load_start = time.time()
-    model = WhisperModel(model_size, device=DEVICE, compute_type=compute_type)
-    load_time = time.time() - load_start
+    # Model loading time is measured when the model is first loaded; rows that only
+    # change beam_size/best_of reuse the resident model and cost no load at all
+    model, load_time, reused = registry.get(model_size, compute_type)
+    if reused:
+        load_time = 0.0
 
     # Measure transcription time
-    transcribe_start = time.time()
+    transcribe_start = time.perf_counter()
     segments, info = model.transcribe(
         test_file,
         beam_size=beam_size,
         best_of=best_of,
     )
     text = " ".join([seg.text for seg in segments])
-    transcribe_time = time.time() - transcribe_start
+    transcribe_time = time.perf_counter() - transcribe_start
 
     total_time = load_time + transcribe_time
 
@@ -54,6 +57,7 @@ def benchmark_config(test_file, model_size, compute_type, beam_size, best_of):
         "beam": beam_size,
         "best_of": best_of,
         "load_time": load_time,
+        "reused": reused,
         "transcribe_time": transcribe_time,
         "total_time": total_time,
         "text": text,
@@ -71,25 +75,32 @@ def main():
 
     results = []
     baseline_text = None
+    supported = supported_compute_types(DEVICE)
+    configs = group_configs([c for c in CONFIGS if not supported or c[1] in supported])
+    registry = ModelRegistry(DEVICE, cpu_threads=PROFILE["cpu_threads"])
 
-    for i, (model_size, compute_type, beam_size, best_of) in enumerate(CONFIGS):
+    for i, (model_size, compute_type, beam_size, best_of) in enumerate(configs):
         config_name = f"{model_size}/{compute_type}/beam={beam_size}"
-        print(f"\n[{i+1}/{len(CONFIGS)}] Testing: {config_name}")
+        print(f"\n[{i+1}/{len(configs)}] Testing: {config_name}")
 
         try:
-            result = benchmark_config(test_file, model_size, compute_type, beam_size, best_of)
+            result = benchmark_config(registry, test_file, model_size, compute_type, beam_size, best_of)
             results.append(result)
 
             if baseline_text is None:
                 baseline_text = result["text"]
 
-            print(f"  Load time:       {result['load_time']:.2f}s")
+            if result["reused"]:
+                print("  Load time:       - (model already loaded, reused)")
+            else:
+                print(f"  Load time:       {result['load_time']:.2f}s")
             print(f"  Transcribe time: {result['transcribe_time']:.2f}s")
             print(f"  Total time:      {result['total_time']:.2f}s")
             print(f"  Output length:   {result['text_len']} chars")
 
         except Exception as e:
             print(f"  ERROR: {e}")
+    registry.release()
 
     # Summary table
     print("\n" + "=" * 80)
@@ -100,7 +111,8 @@ def main():
 
     for r in results:
         config = f"{r['model']}/{r['compute']}/beam={r['beam']}"
-        print(f"{config:<40} {r['load_time']:>6.2f}s {r['transcribe_time']:>6.2f}s {r['total_time']:>6.2f}s {r['text_len']:>6}")
+        load = "reused" if r["reused"] else f"{r['load_time']:.2f}s"
+        print(f"{config:<40} {load:>7} {r['transcribe_time']:>6.2f}s {r['total_time']:>6.2f}s {r['text_len']:>6}")
 
     # Show transcription samples for quality comparison
     print("\n" + "=" * 80)
@@ -116,9 +128,11 @@ def main():
     print("\n" + "=" * 80)
     print("DAEMON VALUE ANALYSIS")
     print("=" * 80)
-    if results:
-        avg_load = sum(r["load_time"] for r in results) / len(results)
-        medium_loads = [r["load_time"] for r in results if r["model"] == "medium"]
+    # Only rows that actually loaded their model say anything about load cost
+    loaded = [r for r in results if not r["reused"]]
+    if loaded:
+        avg_load = sum(r["load_time"] for r in loaded) / len(loaded)
+        medium_loads = [r["load_time"] for r in loaded if r["model"] == "medium"]
         if medium_loads:
             avg_medium_load = sum(medium_loads) / len(medium_loads)
             print(f"Average model load time (all): {avg_load:.2f}s")
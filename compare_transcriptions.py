@@ -5,10 +5,14 @@ Compare transcription quality across different Whisper configurations.
 
 import time
 import sys
-from faster_whisper import WhisperModel
+from transcript_cache import cached_transcribe
+from inference_profile import select_profile, supported_compute_types
+from text_metrics import align, normalize_text, wer
+from model_registry import ModelRegistry, group_configs
 
 DEFAULT_TEST_FILE = "recordings/2026-01-31/14-58-08/audio.wav"
-DEVICE = "cuda"
+PROFILE = select_profile()
+DEVICE = PROFILE["device"]
 
 CONFIGS = [
     ("medium", "float16", 5, 5),
@@ -20,53 +24,53 @@ CONFIGS = [
 ]
 
 
-def transcribe(test_file, model_size, compute_type, beam_size, best_of):
-    model = WhisperModel(model_size, device=DEVICE, compute_type=compute_type)
-    segments, info = model.transcribe(test_file, beam_size=beam_size, best_of=best_of)
+def transcribe(registry, test_file, model_size, compute_type, beam_size, best_of, use_cache=True):
+    def decode(audio, beam_size, best_of):
+        # Only loaded on a cache miss, and reused across beam_size/best_of rows
+        model, _, _ = registry.get(model_size, compute_type)
+        return model.transcribe(audio, beam_size=beam_size, best_of=best_of)
+
+    if use_cache:
+        # Re-running a comparison on the same recording reuses earlier results
+        segments, info, hit = cached_transcribe(test_file, decode, model_size, compute_type, beam_size, best_of)
+    else:
+        segments, info = decode(test_file, beam_size, best_of)
     return " ".join([seg.text for seg in segments])
 
 
 def find_differences(reference, comparison):
-    """Find words that differ between reference and comparison."""
-    ref_words = reference.lower().split()
-    comp_words = comparison.lower().split()
-
-    differences = []
-
-    # Simple word-by-word comparison (not perfect but good enough)
-    max_len = max(len(ref_words), len(comp_words))
-
-    i, j = 0, 0
-    while i < len(ref_words) and j < len(comp_words):
-        if ref_words[i] != comp_words[j]:
-            # Find the extent of the difference
-            ref_word = ref_words[i] if i < len(ref_words) else ""
-            comp_word = comp_words[j] if j < len(comp_words) else ""
-            differences.append((ref_word, comp_word))
-        i += 1
-        j += 1
-
-    return differences
+    """Find words that differ between reference and comparison (edit-distance alignment,
+    so one inserted or dropped word doesn't shift every following word)."""
+    ref_words = normalize_text(reference).split()
+    comp_words = normalize_text(comparison).split()
+    return [(ref_word, comp_word) for op, ref_word, comp_word in align(ref_words, comp_words) if op != "equal"]
 
 
 def main():
-    test_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TEST_FILE
+    use_cache = "--no-cache" not in sys.argv
+    args = [a for a in sys.argv[1:] if a != "--no-cache"]
+    test_file = args[0] if args else DEFAULT_TEST_FILE
 
     print(f"Test file: {test_file}")
     print("=" * 80)
 
     results = []
 
-    for model_size, compute_type, beam_size, best_of in CONFIGS:
+    supported = supported_compute_types(DEVICE)
+    configs = group_configs([c for c in CONFIGS if not supported or c[1] in supported])
+    registry = ModelRegistry(DEVICE, cpu_threads=PROFILE["cpu_threads"])
+
+    for model_size, compute_type, beam_size, best_of in configs:
         config_name = f"{model_size}/{compute_type}/beam={beam_size}"
         print(f"\nTranscribing with {config_name}...", end=" ", flush=True)
 
-        start = time.time()
-        text = transcribe(test_file, model_size, compute_type, beam_size, best_of)
-        elapsed = time.time() - start
+        start = time.perf_counter()
+        text = transcribe(registry, test_file, model_size, compute_type, beam_size, best_of, use_cache)
+        elapsed = time.perf_counter() - start
 
         print(f"done ({elapsed:.1f}s)")
         results.append((config_name, text, elapsed))
+    registry.release()
 
     # Output full transcriptions
     print("\n" + "=" * 80)
@@ -88,7 +92,7 @@ def main():
 
     for config_name, text, elapsed in results[1:]:
         diffs = find_differences(reference_text, text)
-        print(f"\n### {config_name} ###")
+        print(f"\n### {config_name} (WER vs reference: {wer(reference_text, text) * 100:.1f}%) ###")
         if diffs:
             print(f"Found {len(diffs)} potential differences:")
             for ref_word, comp_word in diffs[:20]:  # Limit to first 20
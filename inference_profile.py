@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Pick the Whisper device, precision and model size for this machine.
+
+With a CUDA GPU we use float16 and the full-size model. On CPU-only machines we
+use int8 with tuned thread counts and the largest model whose measured
+real-time factor (RTF) stays comfortably below 1x.
+
+USAGE:
+  python3 inference_profile.py                          # Show the selected profile
+  python3 inference_profile.py --calibrate <audio_file> # Measure CPU models, save the best one
+
+Environment overrides: VOICE2CHATGPT_DEVICE, VOICE2CHATGPT_COMPUTE_TYPE, VOICE2CHATGPT_MODEL.
+"""
+
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+
+GPU_MODEL_SIZE = "medium"
+CPU_DEFAULT_MODEL_SIZE = "base"
+CPU_MODEL_CANDIDATES = ["medium", "small", "base", "tiny"]  # largest first
+TARGET_CPU_RTF = 0.5  # leave headroom for a loaded machine
+MAX_CPU_THREADS = 8   # CTranslate2 gains little beyond this for short dictations
+THREADS_PER_CHUNK_WORKER = 4  # long files: more workers with fewer threads each scale better
+GPU_CHUNK_WORKERS = 2  # overlaps one chunk's CPU-side feature extraction with another's decode
+CALIBRATION_FILE = os.path.join(os.path.expanduser("~"), ".cache", "voice2chatgpt", "cpu_profile.json")
+
+
+def cuda_available():
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def supported_compute_types(device):
+    """Compute types CTranslate2 can run on `device` (empty set if unknown)."""
+    try:
+        import ctranslate2
+        return set(ctranslate2.get_supported_compute_types(device))
+    except Exception:
+        return set()
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def cpu_thread_count():
+    return max(1, min(available_cpus(), MAX_CPU_THREADS))
+
+
+def chunk_workers(profile, workers=None):
+    """
+    Return (num_workers, cpu_threads) for decoding chunks of one long file in parallel.
+    On CPU the cores are split between workers instead of all going to a single decode.
+    """
+    if profile["device"] == "cuda":
+        return workers or GPU_CHUNK_WORKERS, profile["cpu_threads"]
+    cores = available_cpus()
+    workers = workers or max(1, cores // THREADS_PER_CHUNK_WORKER)
+    return workers, max(1, cores // workers)
+
+
+def _calibrated_cpu_model():
+    try:
+        with open(CALIBRATION_FILE) as f:
+            return json.load(f)["model_size"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return CPU_DEFAULT_MODEL_SIZE
+
+
+@lru_cache(maxsize=None)
+def select_profile():
+    """
+    Return a dict with device, compute_type, model_size, cpu_threads and num_workers,
+    suitable for WhisperModel(model_size, device=..., compute_type=..., cpu_threads=..., num_workers=...).
+    """
+    device = os.environ.get("VOICE2CHATGPT_DEVICE") or ("cuda" if cuda_available() else "cpu")
+    if device == "cuda":
+        profile = {
+            "device": "cuda",
+            "compute_type": "float16",
+            "model_size": GPU_MODEL_SIZE,
+            "cpu_threads": 0,  # let CTranslate2 decide; decoding runs on the GPU
+            "num_workers": 1,
+        }
+    else:
+        profile = {
+            "device": "cpu",
+            "compute_type": "int8",
+            "model_size": _calibrated_cpu_model(),
+            "cpu_threads": cpu_thread_count(),
+            "num_workers": 1,
+        }
+    profile["compute_type"] = os.environ.get("VOICE2CHATGPT_COMPUTE_TYPE", profile["compute_type"])
+    profile["model_size"] = os.environ.get("VOICE2CHATGPT_MODEL", profile["model_size"])
+    return profile
+
+
+def calibrate(audio_file):
+    """Measure CPU RTF per candidate model and save the largest one under TARGET_CPU_RTF."""
+    from faster_whisper import WhisperModel
+    from faster_whisper.audio import decode_audio
+
+    audio = decode_audio(audio_file, sampling_rate=16000)
+    duration = len(audio) / 16000
+    threads = cpu_thread_count()
+    print(f"Calibrating on {audio_file} ({duration:.1f}s, {threads} threads, int8)")
+    chosen = None
+    results = {}
+    # Smallest first so a slow machine never waits on a hopeless medium run
+    for model_size in reversed(CPU_MODEL_CANDIDATES):
+        model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=threads)
+        start = time.time()
+        segments, _ = model.transcribe(audio, beam_size=1, best_of=1)
+        for _ in segments:
+            pass
+        rtf = (time.time() - start) / duration
+        results[model_size] = rtf
+        print(f"  {model_size:<8} RTF {rtf:.2f}x")
+        del model
+        if rtf > TARGET_CPU_RTF:
+            break
+        chosen = model_size
+    chosen = chosen or CPU_MODEL_CANDIDATES[-1]
+    os.makedirs(os.path.dirname(CALIBRATION_FILE), exist_ok=True)
+    with open(CALIBRATION_FILE, "w") as f:
+        json.dump({"model_size": chosen, "rtf": results, "cpu_threads": threads}, f, indent=2)
+    print(f"✅ Selected '{chosen}' for CPU (saved to {CALIBRATION_FILE})")
+    return chosen
+
+
+def main():
+    if "--calibrate" in sys.argv:
+        idx = sys.argv.index("--calibrate")
+        if idx + 1 >= len(sys.argv):
+            print("Usage: python3 inference_profile.py --calibrate <audio_file>")
+            return
+        calibrate(sys.argv[idx + 1])
+        select_profile.cache_clear()
+    for key, value in select_profile().items():
+        print(f"{key:<13}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Terminal level meter for the recorder, drawn off the audio thread.
+
+The PortAudio callback only stores the block's peak and RMS in the recorder's
+`levels` array; this thread reads them at most METER_FPS times a second and
+redraws one line, so terminal I/O never delays the callback. Overflows and
+dropped frames are shown on the same line as soon as they happen.
+"""
+
+import math
+import sys
+import threading
+import time
+
+METER_FPS = 15
+METER_FLOOR_DB = -60.0  # an empty bar; 0 dBFS is a full one
+
+
+class LevelMeter:
+    def __init__(self, recorder, width=30, fps=METER_FPS, stream=None):
+        self.recorder = recorder
+        self.width = width
+        self.interval = 1.0 / fps
+        self.stream = stream or sys.stdout
+        self.start_time = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def enabled(stream=None):
+        """Only draw on an interactive terminal (not under the launcher, a daemon or a pipe)."""
+        stream = stream or sys.stdout
+        return hasattr(stream, "isatty") and stream.isatty()
+
+    def _position(self, level):
+        if level <= 0:
+            return 0
+        db = 20 * math.log10(level)
+        return max(0, min(self.width, int((db - METER_FLOOR_DB) / -METER_FLOOR_DB * self.width)))
+
+    def render(self):
+        peak, rms = self.recorder.read_levels()
+        filled, peak_at = self._position(rms), self._position(peak)
+        cells = ["█" if i < filled else " " for i in range(self.width)]
+        if filled < peak_at <= self.width:
+            cells[peak_at - 1] = "|"
+        line = f"\r🎤 {time.time() - self.start_time:5.1f}s [{''.join(cells)}]"
+        overruns = self.recorder.overflows
+        if overruns or self.recorder.dropped_frames:
+            line += f" ⚠️ {overruns} overflows, {self.recorder.dropped_frames} frames dropped"
+        return line
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.stream.write(self.render())
+            self.stream.flush()
+
+    def start(self, start_time=None):
+        self.start_time = start_time or time.time()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="level-meter")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop drawing and clear the meter line."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.stream.write("\r" + " " * (self.width + 60) + "\r")
+        self.stream.flush()
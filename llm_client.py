@@ -0,0 +1,159 @@
+"""
+Client for the local Ollama server used by the "improve with local LLM" action.
+
+- One pooled requests.Session (keep-alive connections, retries on connection errors)
+- Streaming generation, so text can be shown while it is produced
+- JSON mode (Ollama "format": "json") instead of parsing fenced code blocks
+- keep_alive pinning so the model stays loaded between dictations
+"""
+
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+KEEP_ALIVE = "30m"
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 120  # max seconds between two streamed chunks
+
+
+class LLMError(Exception):
+    """Raised when the LLM server is unreachable or returns unusable output."""
+
+
+class OllamaClient:
+    def __init__(self, url, model, keep_alive=KEEP_ALIVE):
+        self.url = url
+        self.model = model
+        self.keep_alive = keep_alive
+        self.session = requests.Session()
+        retries = Retry(total=3, connect=3, read=0, backoff_factor=0.3,
+                        status_forcelist=[502, 503, 504], allowed_methods=frozenset({"POST"}))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def warm_up(self):
+        """Load the model and pin it in memory (an empty prompt makes Ollama just load it)."""
+        try:
+            self.session.post(self.url, json={"model": self.model, "prompt": "", "keep_alive": self.keep_alive},
+                              timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)).close()
+        except requests.RequestException:
+            pass  # warm-up is best effort; generate() reports real errors
+
+    def generate(self, prompt, json_mode=False, on_token=None):
+        """Stream a completion, calling on_token(text) for each chunk. Returns the full text."""
+        payload = {"model": self.model, "prompt": prompt, "stream": True, "keep_alive": self.keep_alive}
+        if json_mode:
+            payload["format"] = "json"
+        parts = []
+        try:
+            with self.session.post(self.url, json=payload, stream=True,
+                                   timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)) as res:
+                res.raise_for_status()
+                for line in res.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise LLMError(chunk["error"])
+                    token = chunk.get("response", "")
+                    parts.append(token)
+                    if on_token and token:
+                        on_token(token)
+                    if chunk.get("done"):
+                        break
+        except (requests.RequestException, ValueError) as e:
+            raise LLMError(str(e))
+        return "".join(parts)
+
+    def generate_json(self, prompt, on_token=None):
+        """Like generate() in JSON mode, returning the parsed object."""
+        raw = self.generate(prompt, json_mode=True, on_token=on_token)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            # Some models still wrap the object in a fenced block
+            if "```" in raw:
+                try:
+                    return json.loads(raw.split("```json")[-1].split("```")[0].strip())
+                except ValueError:
+                    pass
+            raise LLMError(f"invalid JSON from model: {raw[:200]}")
+
+
+class JsonFieldStreamer:
+    """
+    Extracts the value of one top-level string field from a streamed JSON object and
+    passes its decoded characters to on_text as they arrive.
+    """
+
+    ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field, on_text):
+        self.marker = f'"{field}"'
+        self.on_text = on_text
+        self._buffer = ""
+        self._state = "search"  # search -> value -> done
+        self._escape = None
+        self._high_surrogate = None
+
+    def feed(self, chunk):
+        if self._state == "done":
+            return
+        self._buffer += chunk
+        if self._state == "search":
+            idx = self._buffer.find(self.marker)
+            if idx < 0:
+                return
+            rest = self._buffer[idx + len(self.marker):].lstrip()
+            if not rest.startswith(":"):
+                return  # wait for more input (or the marker was a value, not a key)
+            rest = rest[1:].lstrip()
+            if not rest:
+                return
+            if not rest.startswith('"'):
+                self._state = "done"
+                return
+            self._buffer = rest[1:]
+            self._state = "value"
+        self._emit()
+
+    def _emit(self):
+        out = []
+        i = 0
+        buf = self._buffer
+        while i < len(buf):
+            ch = buf[i]
+            if self._escape is not None:
+                self._escape += ch
+                if self._escape.startswith("u"):
+                    if len(self._escape) < 5:
+                        i += 1
+                        continue
+                    try:
+                        code = int(self._escape[1:], 16)
+                    except ValueError:
+                        code = None
+                    if code is not None and 0xD800 <= code < 0xDC00:
+                        self._high_surrogate = code  # emoji etc. arrive as two \u escapes
+                    elif code is not None and 0xDC00 <= code < 0xE000 and self._high_surrogate:
+                        out.append(chr(0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)))
+                        self._high_surrogate = None
+                    elif code is not None:
+                        out.append(chr(code))
+                else:
+                    out.append(self.ESCAPES.get(ch, ch))
+                self._escape = None
+            elif ch == "\\":
+                self._escape = ""
+            elif ch == '"':
+                self._state = "done"
+                break
+            else:
+                out.append(ch)
+            i += 1
+        self._buffer = ""
+        if out:
+            self.on_text("".join(out))
@@ -1,12 +1,20 @@
 from faster_whisper import WhisperModel
+import os
+import sys
 import time
 
-model = WhisperModel("medium", device="cuda", compute_type="float16")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference_profile import select_profile
+
+profile = select_profile()
+model = WhisperModel(profile["model_size"], device=profile["device"], compute_type=profile["compute_type"],
+                     cpu_threads=profile["cpu_threads"])
 
 start = time.time()
 segments, info = model.transcribe("audio.wav")  # Replace with your file
 end = time.time()
 
+print(f"⚙️ Profile: {profile['model_size']} on {profile['device']}/{profile['compute_type']}")
 print("🕒 Transcription time:", round(end - start, 2), "seconds")
 print("🌐 Detected language:", info.language)
 print("📄 Transcription:")
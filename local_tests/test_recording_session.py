@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Audio/desktop modules are not needed to drive a session: stub the ones that are missing
+for name, attrs in [("sounddevice", {}), ("pyperclip", {}), ("playsound", {"playsound": lambda *a, **k: None})]:
+    try:
+        __import__(name)
+    except ImportError:
+        sys.modules[name] = types.SimpleNamespace(**attrs)
+
+import voice_transcriber as vt
+from audio_archive import wait_for_pending_saves
+from recording_session import RecordingSession
+
+BLOCK_SEC = vt.BLOCK_SIZE / vt.SAMPLE_RATE
+
+
+class FakeInputStream:
+    """Feeds blocks of a quiet tone to the callback from a thread, like PortAudio."""
+
+    def __init__(self, samplerate, channels, blocksize, callback):
+        self.blocksize, self.channels, self.callback = blocksize, channels, callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        status = types.SimpleNamespace(input_overflow=False)
+        block = np.full((self.blocksize, self.channels), 0.1, dtype=np.float32)
+        while not self._stop.wait(BLOCK_SEC):
+            self.callback(block, self.blocksize, None, status)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def record(session, path, stop_after=0.2):
+    recorder = threading.Thread(target=vt.record_audio, args=(session, path, True))
+    recorder.start()
+    assert session.wait_started(timeout=2)
+    time.sleep(stop_after)
+    stopped_at = time.time()
+    session.stop()
+    recorder.join(timeout=2)
+    assert not recorder.is_alive()
+    return time.time() - stopped_at
+
+
+def test_stop_ends_recording_promptly_and_sessions_do_not_share_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(vt, "sd", types.SimpleNamespace(InputStream=FakeInputStream))
+    monkeypatch.setattr(vt, "playsound", lambda *a, **k: None)
+    monkeypatch.setattr(vt, "SHOW_LEVEL_METER", False)
+
+    first, second = RecordingSession("quick"), RecordingSession("quick")
+    assert record(first, str(tmp_path / "first.wav")) < 0.2
+    assert not first.recording and first.recorder.frames_recorded > 0
+
+    # Back-to-back in the same process: the second session starts fresh and stops on its own
+    assert second.recording
+    assert record(second, str(tmp_path / "second.wav"), stop_after=0.1) < 0.2
+    assert second.recorder is not first.recorder
+    assert second.action is None and 0 < second.duration_sec < first.duration_sec
+    wait_for_pending_saves()
+    assert (tmp_path / "first.wav").exists() and (tmp_path / "second.wav").exists()
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vad import keep_mask, trim_silence
+
+SAMPLE_RATE = 16000
+BLOCK = 512
+
+
+def test_keep_mask_shorter_than_padding_kernel():
+    # 3 loud blocks (~0.1 s, e.g. the Escape click) < the 17-block padding kernel
+    rms = np.array([0.0, 0.5, 0.5, 0.5, 0.0])
+    keep = keep_mask(rms, np.full(len(rms), BLOCK), SAMPLE_RATE)
+    assert keep.shape == rms.shape
+    assert keep.all()
+
+
+def test_trim_silence_short_tail():
+    audio = np.zeros(13 * BLOCK, dtype=np.float32)
+    audio[10 * BLOCK:] = 0.5
+    trimmed, _, skipped = trim_silence(audio, SAMPLE_RATE)
+    assert len(trimmed) + round(skipped * SAMPLE_RATE) == len(audio)
+
+
+def test_keep_mask_pads_speech_in_long_input():
+    rms = np.zeros(100)
+    rms[50] = 0.5
+    keep = keep_mask(rms, np.full(len(rms), BLOCK), SAMPLE_RATE)
+    assert keep.shape == rms.shape
+    assert keep[42:59].all() and not keep[:41].any() and not keep[60:].any()
+
+
+def test_trim_silence_keeps_quiet_speech():
+    # Low-gain microphone: speech around -48 dBFS, under the fixed SILENCE_RMS, over a -66 dBFS noise floor
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.0005, 5 * SAMPLE_RATE).astype(np.float32)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    audio[2 * SAMPLE_RATE:3 * SAMPLE_RATE] += 0.006 * np.sin(2 * np.pi * 220 * t)
+    trimmed, time_map, skipped = trim_silence(audio, SAMPLE_RATE)
+    assert len(trimmed) >= SAMPLE_RATE
+    assert skipped > 2.0
+    assert abs(time_map.to_original(0.25) - 2.0) < 0.05
@@ -0,0 +1,115 @@
+"""
+Long-file transcription: split at pauses, decode chunks in parallel, stitch.
+
+A single transcribe() call walks an hour-long file one 30 s window at a time
+on one CTranslate2 worker. Here the file is cut at the quietest point near
+every CHUNK_SEC, each chunk is decoded with OVERLAP_SEC of context on both
+sides, and several chunks run at once on a model loaded with num_workers > 1.
+A segment belongs to the chunk whose core (cut to cut) contains its midpoint,
+so segments decoded twice in an overlap are kept only once.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from transcription_daemon import Segment, TranscriptionInfo
+from vad import block_rms
+
+MIN_CHUNK_SEC = 40     # earliest cut after the previous one
+MAX_CHUNK_SEC = 60     # latest cut: the quietest point in between is chosen
+OVERLAP_SEC = 1.0      # context decoded on each side of a cut
+PAUSE_WINDOW_SEC = 0.3  # RMS is smoothed over this so a cut lands in a pause, not a stop consonant
+
+# start/end: samples decoded for the chunk; core_start/core_end: seconds it owns
+Chunk = namedtuple("Chunk", ["start", "end", "core_start", "core_end"])
+
+
+def find_cuts(audio, sample_rate, min_chunk_sec=MIN_CHUNK_SEC, max_chunk_sec=MAX_CHUNK_SEC):
+    """Return the sample positions where the audio is cut (quietest point of each window)."""
+    rms, lengths = block_rms(audio)
+    block = int(lengths[0]) if len(lengths) else 1
+    smooth = max(1, int(PAUSE_WINDOW_SEC * sample_rate / block))
+    energy = np.convolve(rms, np.ones(smooth) / smooth, mode="same")
+    min_blocks = int(min_chunk_sec * sample_rate / block)
+    max_blocks = int(max_chunk_sec * sample_rate / block)
+
+    cuts = []
+    pos = 0
+    while len(energy) - pos > max_blocks:
+        window = energy[pos + min_blocks:pos + max_blocks]
+        pos += min_blocks + int(np.argmin(window))
+        cuts.append(pos * block + block // 2)
+    return cuts
+
+
+def plan_chunks(audio, sample_rate, overlap_sec=OVERLAP_SEC):
+    """Split `audio` into overlapping Chunks cut at pauses."""
+    edges = [0] + find_cuts(audio, sample_rate) + [len(audio)]
+    overlap = int(overlap_sec * sample_rate)
+    chunks = []
+    for i, (start, end) in enumerate(zip(edges, edges[1:])):
+        chunks.append(Chunk(
+            start=max(0, start - overlap),
+            end=min(len(audio), end + overlap),
+            core_start=start / sample_rate if i > 0 else float("-inf"),
+            core_end=end / sample_rate if end < len(audio) else float("inf"),
+        ))
+    return chunks
+
+
+def _decode_chunk(transcribe_fn, audio, chunk, sample_rate, beam_size, best_of):
+    """Decode one chunk. Returns (segments it owns in global time, detected language)."""
+    offset = chunk.start / sample_rate
+    segments, info = transcribe_fn(audio[chunk.start:chunk.end], beam_size=beam_size, best_of=best_of)
+    owned = []
+    for seg in segments:
+        start, end = seg.start + offset, seg.end + offset
+        if chunk.core_start <= (start + end) / 2 < chunk.core_end:
+            owned.append(Segment(start, end, seg.text))
+    return owned, info.language
+
+
+def _stitched(pool, futures, submit_next):
+    """Yield segments chunk by chunk, in order, keeping the pool busy."""
+    try:
+        while futures:
+            segments, _ = futures.popleft().result()
+            submit_next()
+            yield from segments
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def transcribe_long(audio, transcribe_fn, sample_rate, workers=2, beam_size=1, best_of=1):
+    """
+    Transcribe a long file path or float32 array with `workers` chunks decoding at once.
+    transcribe_fn must be safe to call from that many threads (model loaded with num_workers=workers).
+    Returns (segments, info) like faster-whisper: segments is a generator in time order.
+    """
+    if isinstance(audio, str):
+        from faster_whisper.audio import decode_audio
+
+        audio = decode_audio(audio, sampling_rate=sample_rate)
+    chunks = deque(plan_chunks(audio, sample_rate))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = deque()
+
+    def submit_next():
+        # Two chunks per worker in flight: enough to never idle, bounded memory for results
+        while chunks and len(futures) < 2 * workers:
+            futures.append(pool.submit(_decode_chunk, transcribe_fn, audio, chunks.popleft(),
+                                       sample_rate, beam_size, best_of))
+
+    submit_next()
+    # faster-whisper reports the language up front; use the first chunk's
+    try:
+        _, language = futures[0].result()
+    except BaseException:
+        pool.shutdown(wait=False)
+        raise
+    info = TranscriptionInfo(language, len(audio) / sample_rate)
+    return _stitched(pool, futures, submit_next), info
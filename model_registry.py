@@ -0,0 +1,54 @@
+"""
+Keeps Whisper models resident across decoding-parameter sweeps.
+
+A model is loaded once per (model_size, compute_type) and reused for every
+beam_size/best_of combination. When a different model is requested the
+previous one is released first (max_resident=1 by default), so sweeps over
+several sizes never accumulate GPU or host memory.
+"""
+
+import gc
+import time
+from collections import OrderedDict
+
+
+def group_configs(configs):
+    """Reorder (model_size, compute_type, ...) configs so rows sharing a model are adjacent,
+    keeping the order in which each model first appears."""
+    first_seen = {}
+    for config in configs:
+        first_seen.setdefault(config[:2], len(first_seen))
+    return sorted(configs, key=lambda config: first_seen[config[:2]])
+
+
+class ModelRegistry:
+    def __init__(self, device, cpu_threads=0, max_resident=1):
+        self.device = device
+        self.cpu_threads = cpu_threads
+        self.max_resident = max_resident
+        self._models = OrderedDict()  # (model_size, compute_type) -> (model, load_time)
+
+    def get(self, model_size, compute_type):
+        """Return (model, load_time, reused). load_time is the time the model took to load."""
+        key = (model_size, compute_type)
+        if key in self._models:
+            self._models.move_to_end(key)
+            model, load_time = self._models[key]
+            return model, load_time, True
+        while len(self._models) >= self.max_resident:
+            self.release(next(iter(self._models)))
+        from faster_whisper import WhisperModel
+
+        load_start = time.perf_counter()
+        model = WhisperModel(model_size, device=self.device, compute_type=compute_type, cpu_threads=self.cpu_threads)
+        load_time = time.perf_counter() - load_start
+        self._models[key] = (model, load_time)
+        return model, load_time, False
+
+    def release(self, key=None):
+        """Free one model (or all of them when key is None)."""
+        keys = [key] if key is not None else list(self._models)
+        for k in keys:
+            self._models.pop(k, None)
+        # CTranslate2 frees host/GPU memory when the last reference goes away
+        gc.collect()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Resident launcher for quick mode: imports everything and loads the model once,
+then starts a dictation each time run_transcriber_quick.sh writes to its FIFO.
+The hotkey no longer pays for a terminal, a Python start and the imports.
+
+USAGE:
+  python3 quick_launcher.py        # Start (e.g. from your session autostart)
+
+Each FIFO message is one line: "<unix timestamp> <target window id>".
+Pressing the hotkey again while recording stops the recording (like Escape);
+presses while the previous dictation is still being transcribed are dropped,
+so repeated presses do not queue up extra sessions.
+"""
+
+import os
+import stat
+import sys
+import threading
+import time
+
+FIFO_PATH = os.environ.get("VOICE2CHATGPT_QUICK_FIFO", "/tmp/voice2chatgpt_quick.fifo")
+
+
+def create_fifo(path=FIFO_PATH):
+    if os.path.exists(path):
+        if not stat.S_ISFIFO(os.stat(path).st_mode):
+            raise RuntimeError(f"{path} exists and is not a FIFO")
+        os.remove(path)  # stale FIFO from a previous run
+    os.mkfifo(path, 0o600)
+
+
+def read_requests(path=FIFO_PATH):
+    """Yield (timestamp, target_window) for every line written to the FIFO."""
+    while True:
+        # open() blocks until a writer connects; EOF when it closes
+        with open(path) as fifo:
+            for line in fifo:
+                parts = line.split()
+                if not parts:
+                    continue
+                try:
+                    sent_at = float(parts[0])
+                except ValueError:
+                    continue
+                yield sent_at, parts[1] if len(parts) > 1 else None
+
+
+def dictate(vt, session, target_window):
+    try:
+        vt.run_quick_recording(target_window, session=session)
+    except Exception as e:
+        print(f"❌ Dictation failed: {e}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        print(__doc__)
+        return
+    # sounds/, recordings/ and transcripts/ are relative to the project
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    import voice_transcriber as vt
+    from recording_session import RecordingSession
+
+    print("⏳ Warming up (imports, device probe, model)...")
+    warm_start = time.time()
+    vt.warm_up(quick_mode=True, draft=vt.DRAFT_MODE)
+    from pynput import keyboard  # noqa: F401  (Escape listener)
+    print(f"✅ Ready in {time.time() - warm_start:.2f}s, listening on {FIFO_PATH}")
+
+    create_fifo()
+    try:
+        session, thread = None, None
+        for sent_at, target_window in read_requests():
+            if thread is not None and thread.is_alive():
+                if session.recording:
+                    print("⏹️ Hotkey pressed again: stopping the recording.")
+                    session.stop()
+                continue  # still transcribing the previous dictation
+            print(f"\n🎙️ Quick dictation (request received {time.time() - sent_at:.3f}s after the hotkey)")
+            session = RecordingSession("quick", sent_at)
+            thread = threading.Thread(target=dictate, args=(vt, session, target_window), daemon=True)
+            thread.start()
+    except KeyboardInterrupt:
+        print("\n👋 Launcher stopped.")
+    finally:
+        if os.path.exists(FIFO_PATH):
+            os.remove(FIFO_PATH)
+
+
+if __name__ == "__main__":
+    main()
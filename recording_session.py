@@ -0,0 +1,84 @@
+"""
+State of one dictation (or one file transcription), shared by the recorder,
+the key listener and the transcriber.
+
+Stopping is a threading.Event: whoever ends the recording (a key press, the
+resident launcher, a test) wakes the recorder at once. Every session is its
+own object, so back-to-back sessions in one process share no state, and
+background work (stats, indexing, draft refinement) keeps the session it
+belongs to.
+
+Programmatic use:
+    session = RecordingSession("quick")
+    threading.Timer(5, session.stop).start()   # or session.stop(action=2) from any thread
+    text = voice_transcriber.run_quick_recording(session=session)
+"""
+
+import threading
+
+import session_trace
+
+# Number row, then keypad and layout-specific virtual key codes -> action
+KEY_ACTIONS = {'1': 1, '2': 2, '3': 3, '4': 4, '5': 5}
+VK_ACTIONS = {97: 1, 98: 2, 99: 3, 100: 4, 101: 5, 53: 5, 229: 5}
+
+
+class RecordingSession:
+    def __init__(self, mode="interactive", hotkey_time=None):
+        self.mode = mode
+        self.trace = session_trace.start_session(hotkey_time, mode)
+        self.action = None  # action key chosen while recording (interactive mode)
+        self.recorder = None  # RingBufferRecorder (audio, per-block RMS, overrun counters)
+        self.start_time = None
+        self.duration_sec = 0
+        self.audio_path = None
+        self.transcript_path = None
+        self.refine_future = None  # draft refinement writing to transcript_path in the background
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        self._stopped = threading.Event()
+
+    @property
+    def recording(self):
+        return not self._stopped.is_set()
+
+    def mark_started(self, start_time):
+        self.start_time = start_time
+        self._started.set()
+
+    def wait_started(self, timeout=None):
+        """Block until the microphone is open (True) or the timeout expires (False)."""
+        return self._started.wait(timeout)
+
+    def stop(self, action=None):
+        """End the recording now. Safe from any thread; the first action given wins."""
+        with self._lock:
+            if self.action is None:
+                self.action = action
+        self._stopped.set()
+
+    def wait_stopped(self, timeout=None):
+        return self._stopped.wait(timeout)
+
+    def stop_on_action_key(self, key):
+        """pynput on_press handler for interactive mode: keys 1-5 stop with that action."""
+        if getattr(key, "char", None) in KEY_ACTIONS:
+            self.stop(KEY_ACTIONS[key.char])
+        elif getattr(key, "vk", None) in VK_ACTIONS:
+            self.stop(VK_ACTIONS[key.vk])
+
+    def stop_on_escape(self, key):
+        """pynput on_press handler for quick mode: Escape stops."""
+        from pynput import keyboard
+
+        if key == keyboard.Key.esc:
+            self.stop()
+
+
+def start_key_listener(on_press):
+    """Start a pynput listener thread; the caller stops it once the session is over."""
+    from pynput import keyboard
+
+    listener = keyboard.Listener(on_press=on_press)
+    listener.start()
+    return listener
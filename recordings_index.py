@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Full-text index of the recordings archive (SQLite FTS5).
+
+Every saved transcript is added to recordings/index.sqlite3 together with its
+date, duration, model config and folder, so old notes are found without
+reading thousands of transcript.txt files.
+
+USAGE:
+  python3 recordings_index.py --search "mercury dashboard"   # Search transcripts
+  python3 recordings_index.py --rebuild                      # Sync the index with the folder tree
+
+--rebuild is incremental: unchanged transcripts are skipped, deleted folders are
+dropped, and the tree is scanned by several threads at once.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+RECORDINGS_DIR = "recordings"
+INDEX_PATH = os.environ.get("VOICE2CHATGPT_INDEX", os.path.join(RECORDINGS_DIR, "index.sqlite3"))
+SCAN_WORKERS = 16  # the rebuild is I/O bound (small reads + audio header probes)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY,
+    folder TEXT UNIQUE NOT NULL,
+    recorded_at TEXT,
+    duration REAL,
+    model_size TEXT,
+    compute_type TEXT,
+    transcript_mtime REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_recorded_at ON recordings(recorded_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts USING fts5(
+    text, content='recordings', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS recordings_ai AFTER INSERT ON recordings BEGIN
+    INSERT INTO transcripts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS recordings_ad AFTER DELETE ON recordings BEGIN
+    INSERT INTO transcripts(transcripts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS recordings_au AFTER UPDATE OF text ON recordings BEGIN
+    INSERT INTO transcripts(transcripts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO transcripts(rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+# Rebuilds keep the model config of rows indexed at save time (it is not stored on disk)
+UPSERT = """
+INSERT INTO recordings (folder, recorded_at, duration, model_size, compute_type, transcript_mtime, text)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(folder) DO UPDATE SET
+    recorded_at = excluded.recorded_at,
+    duration = COALESCE(excluded.duration, recordings.duration),
+    model_size = COALESCE(excluded.model_size, recordings.model_size),
+    compute_type = COALESCE(excluded.compute_type, recordings.compute_type),
+    transcript_mtime = excluded.transcript_mtime,
+    text = excluded.text
+"""
+
+
+def connect(path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    # WAL: searches never block the background save of a new transcript
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def recorded_at_from_folder(folder):
+    """'recordings/2025-05-03/14-38-12_Topic' -> '2025-05-03 14:38:12' (None if not that layout)."""
+    day = os.path.basename(os.path.dirname(os.path.normpath(folder)))
+    clock = os.path.basename(os.path.normpath(folder)).split("_", 1)[0]
+    try:
+        return datetime.strptime(f"{day} {clock}", "%Y-%m-%d %H-%M-%S").strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def index_recording(folder, text, duration=None, model_size=None, compute_type=None, path=INDEX_PATH):
+    """Add or update one recording (called each time a transcript is saved)."""
+    transcript = os.path.join(folder, "transcript.txt")
+    mtime = os.path.getmtime(transcript) if os.path.exists(transcript) else None
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute(UPSERT, (os.path.normpath(folder), recorded_at_from_folder(folder), duration,
+                                  model_size, compute_type, mtime, text))
+    finally:
+        conn.close()
+
+
+def rename_recording(old_folder, new_folder, path=INDEX_PATH):
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("UPDATE recordings SET folder = ? WHERE folder = ?",
+                         (os.path.normpath(new_folder), os.path.normpath(old_folder)))
+    finally:
+        conn.close()
+
+
+def remove_recording(folder, path=INDEX_PATH):
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM recordings WHERE folder = ?", (os.path.normpath(folder),))
+    finally:
+        conn.close()
+
+
+def fts_query(query):
+    """Turn free text into an FTS5 query: every word must match, a trailing * is a prefix search."""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def search(query, limit=20, path=INDEX_PATH):
+    """Return [(folder, recorded_at, duration, snippet)] best matches first."""
+    match = fts_query(query)
+    if not match or not os.path.exists(path):
+        return []
+    conn = connect(path)
+    try:
+        return conn.execute(
+            """
+            SELECT r.folder, r.recorded_at, r.duration, snippet(transcripts, 0, '[', ']', '…', 12)
+            FROM transcripts JOIN recordings r ON r.id = transcripts.rowid
+            WHERE transcripts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def print_results(query, results):
+    if not results:
+        print(f"🔍 No recordings match: {query}")
+        return
+    print(f"🔍 {len(results)} recording(s) matching: {query}\n")
+    for folder, recorded_at, duration, snippet in results:
+        length = f", {duration:.0f}s" if duration else ""
+        print(f"📁 {folder} ({recorded_at or 'unknown date'}{length})")
+        print(f"   {' '.join(snippet.split())}\n")
+
+
+def _scan_day(day_dir, known_mtimes):
+    """Read every recording of one day folder. Runs in a scan thread.
+    Returns (rows to upsert, folders seen)."""
+    from audio_archive import find_recording_audio
+    from audio_probe import probe_duration
+
+    rows = []
+    seen = []
+    for entry in os.scandir(day_dir):
+        if not entry.is_dir():
+            continue
+        folder = os.path.normpath(entry.path)
+        transcript = os.path.join(folder, "transcript.txt")
+        try:
+            mtime = os.path.getmtime(transcript)
+        except OSError:
+            continue
+        seen.append(folder)
+        if known_mtimes.get(folder) == mtime:
+            continue
+        with open(transcript) as f:
+            text = f.read()
+        audio = find_recording_audio(folder)
+        duration = probe_duration(audio) if audio else None
+        rows.append((folder, recorded_at_from_folder(folder), duration, None, None, mtime, text))
+    return rows, seen
+
+
+def rebuild(root=RECORDINGS_DIR, path=INDEX_PATH, workers=SCAN_WORKERS):
+    """Sync the index with the folder tree. Returns (updated, removed, total)."""
+    conn = connect(path)
+    try:
+        known_mtimes = dict(conn.execute("SELECT folder, transcript_mtime FROM recordings"))
+        day_dirs = [entry.path for entry in os.scandir(root) if entry.is_dir()] if os.path.isdir(root) else []
+        updated = 0
+        seen = set()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Threads read and probe files; this thread is the only SQLite writer
+            with conn:
+                for rows, folders in pool.map(lambda d: _scan_day(d, known_mtimes), day_dirs):
+                    conn.executemany(UPSERT, rows)
+                    updated += len(rows)
+                    seen.update(folders)
+        gone = [(folder,) for folder in known_mtimes if folder not in seen]
+        with conn:
+            conn.executemany("DELETE FROM recordings WHERE folder = ?", gone)
+            conn.execute("INSERT INTO transcripts(transcripts) VALUES ('optimize')")
+        return updated, len(gone), len(seen)
+    finally:
+        conn.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if "--rebuild" in args:
+        start = time.time()
+        updated, removed, total = rebuild()
+        print(f"✅ Index synced in {time.time() - start:.1f}s: {total} recordings, "
+              f"{updated} (re)indexed, {removed} removed ({INDEX_PATH})")
+    elif "--search" in args and args.index("--search") + 1 < len(args):
+        query = " ".join(args[args.index("--search") + 1:])
+        print_results(query, search(query))
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Ring-buffer audio recorder.
+
+The PortAudio callback only copies each block into a preallocated NumPy ring
+(no per-block allocation, no queue) and publishes it by bumping a counter.
+It also stores the block's peak and RMS in `levels` for a meter drawn by
+another thread (see level_meter.py); it never prints.
+A single writer thread drains everything available in bulk: one WAV write per
+drain, optional in-memory accumulation, and per-block hand-off to listeners
+such as the streaming transcriber. Overflows reported by PortAudio and blocks
+dropped because the writer fell behind are counted.
+
+Single producer (callback) / single consumer (writer): each counter is only
+ever written by one side, so no lock is needed.
+"""
+
+import math
+import threading
+
+import numpy as np
+import soundfile as sf
+
+CAPACITY_SEC = 30       # audio the writer may lag behind before blocks are dropped
+FLUSH_INTERVAL = 0.1    # seconds between bulk drains
+MIN_BLOCK_FRAMES = 64   # sizes the block metadata ring for the smallest plausible block
+
+
+class RingBufferRecorder:
+    def __init__(self, sample_rate, channels, filename=None, keep_in_memory=True, on_block=None):
+        """
+        filename: WAV file to write (None for in-memory only).
+        on_block(block, rms): called from the writer thread for every recorded block, in order.
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.filename = filename
+        self.keep_in_memory = keep_in_memory
+        self.on_block = on_block
+
+        self.capacity = CAPACITY_SEC * sample_rate
+        self.block_capacity = self.capacity // MIN_BLOCK_FRAMES
+        self._ring = np.zeros((self.capacity, channels), dtype=np.float32)
+        self._block_lengths = np.zeros(self.block_capacity, dtype=np.int64)
+        self._block_rms = np.zeros(self.block_capacity, dtype=np.float64)
+        self._write_pos = 0    # frames ever written (callback only)
+        self._block_write = 0  # blocks ever published (callback only)
+        self._read_pos = 0     # frames ever drained (writer only)
+        self._block_read = 0   # blocks ever drained (writer only)
+
+        self.levels = np.zeros(2, dtype=np.float64)  # [peak held since last read_levels(), last block RMS]
+        self.overflows = 0
+        self.dropped_frames = 0
+        self.frames_recorded = 0
+        self.block_rms = []
+        self.block_lengths = []
+        self._chunks = []
+        self._stop = threading.Event()
+        self._writer = None
+        self._file = None
+
+    # === Real-time side ===
+
+    def callback(self, indata, frames, time_info, status):
+        """PortAudio input callback: copy into the ring, never allocate or block."""
+        if status.input_overflow:
+            self.overflows += 1
+        flat = indata.reshape(-1)
+        rms = math.sqrt(float(np.dot(flat, flat)) / flat.size) if flat.size else 0.0
+        peak = max(float(flat.max()), -float(flat.min())) if flat.size else 0.0
+        if peak > self.levels[0]:
+            self.levels[0] = peak
+        self.levels[1] = rms
+        write = self._write_pos
+        if (write + frames - self._read_pos > self.capacity
+                or self._block_write - self._block_read >= self.block_capacity):
+            self.dropped_frames += frames
+            return
+        start = write % self.capacity
+        end = start + frames
+        if end <= self.capacity:
+            self._ring[start:end] = indata
+        else:
+            split = self.capacity - start
+            self._ring[start:] = indata[:split]
+            self._ring[:end - self.capacity] = indata[split:]
+        slot = self._block_write % self.block_capacity
+        self._block_lengths[slot] = frames
+        self._block_rms[slot] = rms
+        self._write_pos = write + frames
+        self._block_write += 1  # publish last: the writer only trusts published blocks
+
+    def read_levels(self):
+        """Return (peak since the previous call, latest RMS) for a level meter."""
+        peak, rms = float(self.levels[0]), float(self.levels[1])
+        self.levels[0] = 0.0  # a peak landing in between is lost: fine for a meter
+        return peak, rms
+
+    # === Writer side ===
+
+    def start(self):
+        if self.filename:
+            self._file = sf.SoundFile(self.filename, mode='w', samplerate=self.sample_rate, channels=self.channels)
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _write_loop(self):
+        while not self._stop.wait(FLUSH_INTERVAL):
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        published = self._block_write
+        if published == self._block_read:
+            return
+        slots = np.arange(self._block_read, published) % self.block_capacity
+        lengths = self._block_lengths[slots]
+        rms = self._block_rms[slots]
+        n = int(lengths.sum())
+        start = self._read_pos % self.capacity
+        if start + n <= self.capacity:
+            chunk = self._ring[start:start + n].copy()
+        else:
+            chunk = np.concatenate((self._ring[start:], self._ring[:start + n - self.capacity]))
+        # Release the ring space before the (possibly slow) consumers run
+        self._read_pos += n
+        self._block_read = published
+
+        if self._file is not None:
+            self._file.write(chunk)
+        if self.keep_in_memory:
+            self._chunks.append(chunk)
+        self.block_rms.extend(rms.tolist())
+        self.block_lengths.extend(lengths.tolist())
+        self.frames_recorded += n
+        if self.on_block:
+            offset = 0
+            for length, level in zip(lengths, rms):
+                self.on_block(chunk[offset:offset + length], float(level))
+                offset += length
+
+    def stop(self):
+        """Stop the writer after a final drain and close the WAV file."""
+        self._stop.set()
+        if self._writer:
+            self._writer.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_audio(self):
+        """Return the whole recording as a mono float32 array (requires keep_in_memory)."""
+        if not self._chunks:
+            return np.zeros(0, dtype=np.float32)
+        audio = np.concatenate(self._chunks)
+        self._chunks = [audio]
+        return audio.mean(axis=1) if self.channels > 1 else audio[:, 0]
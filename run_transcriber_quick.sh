@@ -2,7 +2,17 @@
 # Quick dictation mode: record -> transcribe -> paste at cursor + Enter
 # Bind this to a global hotkey (e.g., Super+Shift+V)
 
-# Capture the currently focused window BEFORE opening terminal
+# Capture the hotkey time (for latency traces) and the focused window BEFORE opening terminal
+HOTKEY_TIME=$(date +%s.%N)
 ORIGINAL_WINDOW=$(xdotool getactivewindow)
 
-terminator -e "bash -c 'source /home/remi/.virtualenvs/whisper/bin/activate && cd /home/remi/voice2clipboard && python voice_transcriber.py --quick --target-window $ORIGINAL_WINDOW'"
+# If the resident launcher (quick_launcher.py) is running, just signal it: no Python start
+FIFO=${VOICE2CHATGPT_QUICK_FIFO:-/tmp/voice2chatgpt_quick.fifo}
+if [ -p "$FIFO" ]; then
+    # timeout: a stale FIFO with no reader would block the write forever
+    if timeout 0.5 bash -c "echo '$HOTKEY_TIME $ORIGINAL_WINDOW' > '$FIFO'"; then
+        exit 0
+    fi
+fi
+
+terminator -e "bash -c 'source /home/remi/.virtualenvs/whisper/bin/activate && cd /home/remi/voice2clipboard && python voice_transcriber.py --quick --target-window $ORIGINAL_WINDOW --hotkey-time $HOTKEY_TIME'"
@@ -0,0 +1,118 @@
+"""
+Finding the ChatGPT '+' icon on screen without full-screen template matching.
+
+The template is loaded once (grayscale, downscaled). Each search screenshots as
+little as possible, in order:
+  1. around the last position found for this window size (cached on disk)
+  2. the bottom part of the active window, where the input box lives
+  3. the whole active window, then the whole screen
+Matching runs on downscaled grayscale images with OpenCV.
+"""
+
+import json
+import os
+import subprocess
+import time
+
+import cv2
+import numpy as np
+
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "voice2chatgpt", "locator.json")
+MATCH_SCALE = 0.5        # screenshots and template are matched at this scale
+ROI_BOTTOM_FRACTION = 0.4  # the input box sits in the bottom part of the window
+CACHE_MARGIN = 3         # cached search region: this many template sizes around the last hit
+
+
+def active_window_geometry():
+    """Return (x, y, width, height) of the active window, or None (no xdotool / no X11)."""
+    try:
+        out = subprocess.run(["xdotool", "getactivewindow", "getwindowgeometry", "--shell"],
+                             capture_output=True, text=True, timeout=1).stdout
+        values = dict(line.split("=", 1) for line in out.split() if "=" in line)
+        return int(values["X"]), int(values["Y"]), int(values["WIDTH"]), int(values["HEIGHT"])
+    except (OSError, subprocess.SubprocessError, KeyError, ValueError):
+        return None
+
+
+class TemplateLocator:
+    def __init__(self, template_path, confidence=0.85, scale=MATCH_SCALE, cache_file=CACHE_FILE):
+        template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+        if template is None:
+            raise FileNotFoundError(template_path)
+        self.template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        self.template_size = (template.shape[1], template.shape[0])  # full-resolution (w, h)
+        self.confidence = confidence
+        self.scale = scale
+        self.cache_file = cache_file
+        self._cache = self._load_cache()
+        self.last_latency = None
+        self.last_stage = None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def _match(self, region):
+        """Template-match inside region (x, y, w, h). Returns the screen center of the hit or None."""
+        import pyautogui
+
+        x, y, w, h = region
+        if w < self.template_size[0] or h < self.template_size[1]:
+            return None
+        shot = np.asarray(pyautogui.screenshot(region=(x, y, w, h)).convert("L"))
+        shot = cv2.resize(shot, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if shot.shape[0] < self.template.shape[0] or shot.shape[1] < self.template.shape[1]:
+            return None
+        scores = cv2.matchTemplate(shot, self.template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (bx, by) = cv2.minMaxLoc(scores)
+        if best < self.confidence:
+            return None
+        return (x + int((bx + self.template.shape[1] / 2) / self.scale),
+                y + int((by + self.template.shape[0] / 2) / self.scale))
+
+    def _regions(self, window, key):
+        """Yield (stage, region) from the cheapest search to the most expensive."""
+        import pyautogui
+
+        if window:
+            wx, wy, ww, wh = window
+            cached = self._cache.get(key)
+            if cached:
+                tw, th = self.template_size
+                cx, cy = wx + cached[0], wy + cached[1]
+                left, top = max(wx, cx - CACHE_MARGIN * tw), max(wy, cy - CACHE_MARGIN * th)
+                yield "cached", (left, top, min(wx + ww, cx + CACHE_MARGIN * tw) - left,
+                                 min(wy + wh, cy + CACHE_MARGIN * th) - top)
+            roi_top = wy + int(wh * (1 - ROI_BOTTOM_FRACTION))
+            yield "window bottom", (wx, roi_top, ww, wy + wh - roi_top)
+            yield "window", window
+        width, height = pyautogui.size()
+        yield "screen", (0, 0, width, height)
+
+    def locate(self):
+        """Return the screen center of the template, or None. Sets last_latency and last_stage."""
+        start = time.perf_counter()
+        window = active_window_geometry()
+        key = f"{window[2]}x{window[3]}" if window else None
+        for stage, region in self._regions(window, key):
+            hit = self._match(region)
+            if hit:
+                self.last_latency = time.perf_counter() - start
+                self.last_stage = stage
+                if window and stage != "cached":
+                    self._cache[key] = [hit[0] - window[0], hit[1] - window[1]]
+                    self._save_cache()
+                return hit
+        self.last_latency = time.perf_counter() - start
+        self.last_stage = None
+        return None
@@ -0,0 +1,79 @@
+"""
+Segment-by-segment transcript output.
+
+faster-whisper yields segments lazily while it decodes; SegmentWriter consumes
+them as they arrive instead of waiting for the whole file, so long
+transcriptions show (and save) text progressively.
+"""
+
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:05.2f}"
+    return f"{minutes:02d}:{seconds:05.2f}"
+
+
+def segment_record(seg):
+    """JSON-serializable form of a segment (one line of a .jsonl transcript)."""
+    return {"start": round(seg.start, 3), "end": round(seg.end, 3), "text": seg.text.strip()}
+
+
+def type_at_cursor(text):
+    # xdotool handles non-ASCII text, which pyautogui.write() does not
+    subprocess.run(["xdotool", "type", "--clearmodifiers", "--delay", "0", "--", text])
+
+
+class SegmentWriter:
+    """
+    Writes each segment as it is decoded: appended to the transcript file, optionally
+    printed with its timestamps, written as a JSON line and typed at the cursor.
+    """
+
+    def __init__(self, transcript_path, jsonl_path=None, echo=True, type_text=False):
+        self.parts = []
+        self.echo = echo
+        self._transcript = open(transcript_path, "w")
+        self._jsonl = open(jsonl_path, "w") if jsonl_path else None
+        # One typing thread keeps segments in order without stalling the decoder
+        self._typist = ThreadPoolExecutor(max_workers=1) if type_text else None
+
+    def write(self, seg):
+        # Same separator as the joined text, so the file matches the clipboard
+        piece = seg.text if not self.parts else " " + seg.text
+        self.parts.append(seg.text)
+        self._transcript.write(piece)
+        self._transcript.flush()
+        if self._jsonl:
+            self._jsonl.write(json.dumps(segment_record(seg), ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+        if self.echo:
+            print(f"[{format_timestamp(seg.start)} → {format_timestamp(seg.end)}] {seg.text.strip()}", flush=True)
+        if self._typist:
+            self._typist.submit(type_at_cursor, piece)
+
+    def write_all(self, segments):
+        for seg in segments:
+            self.write(seg)
+        return self.close()
+
+    def close(self):
+        """Flush everything (waits for pending typing) and return the full text."""
+        if self._typist:
+            self._typist.shutdown(wait=True)
+            self._typist = None
+        self._transcript.close()
+        if self._jsonl:
+            self._jsonl.close()
+        return " ".join(self.parts)
+
+
+def write_jsonl(path, segments):
+    with open(path, "w") as f:
+        for seg in segments:
+            f.write(json.dumps(segment_record(seg), ensure_ascii=False) + "\n")
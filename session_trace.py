@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Per-dictation stage timings, written as JSON lines to the recording folder.
+
+Each line is one stage of one session, e.g.
+  {"session": "2025-05-03T14:38:12", "mode": "quick", "stage": "decode", "start": 4.12, "duration": 0.83}
+`start` is relative to the session start (negative for the hotkey press, which
+happens before the process or launcher notices it).
+
+USAGE (report):
+  python3 session_trace.py                       # p50/p95 per stage over recordings/
+  python3 session_trace.py recordings --days 7   # Only sessions of the last 7 days
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TRACE_FILE = "trace.jsonl"
+
+
+class SessionTrace:
+    """Collects stage timings of one session. Lines are buffered until the folder is known."""
+
+    def __init__(self, hotkey_time=None, mode=None):
+        self.t0 = time.time()
+        self.session = datetime.fromtimestamp(self.t0).strftime("%Y-%m-%dT%H:%M:%S")
+        self.hotkey_time = hotkey_time
+        self.mode = mode
+        self.path = None
+        self._buffer = []
+        self._lock = threading.Lock()  # stages are recorded from background threads too
+
+    def attach(self, folder):
+        """Start writing to `folder` (flushing what was recorded so far)."""
+        with self._lock:
+            self.path = os.path.join(folder, TRACE_FILE)
+            buffered, self._buffer = self._buffer, []
+            self._append(buffered)
+
+    def move(self, folder):
+        """Follow the session folder after a rename."""
+        with self._lock:
+            self.path = os.path.join(folder, TRACE_FILE)
+
+    def _append(self, entries):
+        if not entries:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        except OSError:
+            pass  # tracing must never break a dictation
+
+    def record(self, stage, duration, start=None, **attrs):
+        """Record a stage measured elsewhere (`start` is a time.time() value)."""
+        entry = {"session": self.session, "mode": self.mode, "stage": stage,
+                 "start": round(start - self.t0, 4) if start is not None else None,
+                 "duration": round(duration, 4)}
+        entry.update(attrs)
+        with self._lock:
+            if self.path:
+                self._append([entry])
+            else:
+                self._buffer.append(entry)
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """Time the enclosed block. The yielded dict can receive extra attributes."""
+        start = time.time()
+        try:
+            yield attrs
+        finally:
+            self.record(stage, time.time() - start, start, **attrs)
+
+    def since_hotkey(self, stage, now=None):
+        """Record the time from the hotkey press to now (no-op when the press time is unknown)."""
+        if self.hotkey_time:
+            now = now or time.time()
+            self.record(stage, now - self.hotkey_time, self.hotkey_time)
+
+
+_current = None
+
+
+def start_session(hotkey_time=None, mode=None):
+    global _current
+    _current = SessionTrace(hotkey_time, mode)
+    return _current
+
+
+def current():
+    """The trace of the running session (one is started on first use)."""
+    return _current or start_session()
+
+
+# === Report ===
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))  # ceil
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def load_traces(root, days=None):
+    """Return {stage: [durations]} over every trace under root (recordings/<day>/<time>/)."""
+    cutoff = datetime.fromtimestamp(time.time() - days * 86400).strftime("%Y-%m-%dT%H:%M:%S") if days else None
+    durations = {}
+    for path in glob.glob(os.path.join(root, "*", "*", TRACE_FILE)):
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if cutoff and entry.get("session", "") < cutoff:
+                    continue
+                durations.setdefault(entry["stage"], []).append(entry["duration"])
+    return durations
+
+
+def report(durations):
+    print(f"{'Stage':<20} {'Count':>6} {'p50':>9} {'p95':>9} {'Max':>9}")
+    print("-" * 57)
+    for stage, values in sorted(durations.items()):
+        values = sorted(values)
+        print(f"{stage:<20} {len(values):>6} {percentile(values, 50):>8.3f}s {percentile(values, 95):>8.3f}s "
+              f"{values[-1]:>8.3f}s")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] in ["--help", "-h"]:
+        print(__doc__)
+        return
+    days = None
+    if "--days" in args:
+        idx = args.index("--days")
+        days = float(args[idx + 1])
+        del args[idx:idx + 2]
+    root = args[0] if args else "recordings"
+    durations = load_traces(root, days)
+    if not durations:
+        print(f"❌ No {TRACE_FILE} files found under {root}")
+        return
+    report(durations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Incremental transcription of a live recording.
+
+Blocks from the recorder are accumulated and cut into chunks at pauses in the
+speech; each committed chunk is decoded in a background thread while the user
+keeps talking. When recording stops only the last (tail) chunk is left to decode.
+Silent spans inside each chunk are dropped before decoding (see vad.py).
+"""
+
+import queue
+import threading
+
+import numpy as np
+
+from transcription_daemon import Segment
+from vad import SILENCE_RMS, trim_silence
+
+MIN_CHUNK_SEC = 8.0      # don't cut before this much audio is pending
+MAX_CHUNK_SEC = 25.0     # force a cut before Whisper's 30 s window
+MIN_SILENCE_SEC = 0.4    # length of a pause we are willing to cut in
+
+
+class StreamingTranscriber:
+    def __init__(self, transcribe_fn, sample_rate, beam_size=1, best_of=1, trim=True):
+        """`transcribe_fn(audio, beam_size, best_of)` must return (segments, info) like WhisperModel.transcribe."""
+        self.transcribe_fn = transcribe_fn
+        self.sample_rate = sample_rate
+        self.beam_size = beam_size
+        self.best_of = best_of
+        self.trim = trim
+        self.silence_skipped_sec = 0.0
+        self._blocks = []
+        self._rms = []
+        self._pending_frames = 0
+        self._offset_frames = 0  # position of the first pending frame in the recording
+        self._chunks = queue.Queue()
+        self._segments = []
+        self._error = None
+        self.chunks_decoded = 0
+        self._worker = threading.Thread(target=self._decode_loop, daemon=True)
+        self._worker.start()
+
+    def feed(self, block, rms=None):
+        """Add a recorded block (frames x channels or mono) and its RMS if already known.
+        Call from the recorder thread."""
+        block = block.reshape(len(block), -1).mean(axis=1) if block.ndim > 1 else block
+        self._blocks.append(block.astype(np.float32, copy=False))
+        if rms is None:
+            rms = float(np.sqrt(np.mean(block ** 2))) if len(block) else 0.0
+        self._rms.append(rms)
+        self._pending_frames += len(block)
+        if self._pending_frames >= MIN_CHUNK_SEC * self.sample_rate:
+            cut = self._find_cut()
+            if cut is not None:
+                self._commit(cut)
+
+    def _find_cut(self):
+        """Return the block index to cut at (exclusive), or None to keep accumulating."""
+        rms = np.asarray(self._rms)
+        lengths = np.fromiter((len(b) for b in self._blocks), dtype=np.int64, count=len(self._blocks))
+        silent = rms < SILENCE_RMS
+        frames_before = np.cumsum(lengths)
+        # Walk back from the newest block looking for a long enough run of silence
+        run_frames = 0
+        for i in range(len(silent) - 1, -1, -1):
+            if silent[i]:
+                run_frames += lengths[i]
+                if run_frames >= MIN_SILENCE_SEC * self.sample_rate:
+                    # Cut in the middle of the pause so neither side loses a word edge
+                    run_end = i
+                    while run_end < len(silent) and silent[run_end]:
+                        run_end += 1
+                    cut = max(1, (i + run_end) // 2)
+                    if frames_before[cut - 1] < MIN_CHUNK_SEC / 2 * self.sample_rate:
+                        break  # only pauses too close to the chunk start remain
+                    return cut
+            else:
+                run_frames = 0
+        if self._pending_frames >= MAX_CHUNK_SEC * self.sample_rate:
+            # No pause found: cut at the quietest block in the second half
+            half = len(rms) // 2
+            return half + int(np.argmin(rms[half:])) + 1
+        return None
+
+    def _commit(self, cut):
+        audio = np.concatenate(self._blocks[:cut])
+        offset = self._offset_frames / self.sample_rate
+        if self.trim:
+            lengths = [len(b) for b in self._blocks[:cut]]
+            trimmed, time_map, skipped = trim_silence(audio, self.sample_rate, self._rms[:cut], lengths)
+            self.silence_skipped_sec += skipped
+            if len(trimmed):
+                self._chunks.put((offset, trimmed, time_map))
+        else:
+            self._chunks.put((offset, audio, None))
+        self._offset_frames += len(audio)
+        self._pending_frames -= len(audio)
+        del self._blocks[:cut]
+        del self._rms[:cut]
+
+    def _decode_loop(self):
+        while True:
+            item = self._chunks.get()
+            if item is None:
+                return
+            offset, audio, time_map = item
+            to_chunk_time = time_map.to_original if time_map else (lambda t: t)
+            try:
+                segments, _ = self.transcribe_fn(audio, beam_size=self.beam_size, best_of=self.best_of)
+                self._segments.extend(
+                    Segment(offset + to_chunk_time(seg.start), offset + to_chunk_time(seg.end), seg.text)
+                    for seg in segments
+                )
+                self.chunks_decoded += 1
+            except Exception as e:
+                self._error = e
+            finally:
+                self._chunks.task_done()
+
+    def finish(self):
+        """Commit the tail, wait for all chunks, and return the list of segments with global timestamps."""
+        if self._blocks:
+            self._commit(len(self._blocks))
+        self._chunks.join()
+        self._chunks.put(None)
+        self._worker.join()
+        if self._error is not None:
+            raise self._error
+        return self._segments
+
+    def cancel(self):
+        """Stop decoding without waiting for pending chunks."""
+        self._blocks.clear()
+        self._rms.clear()
+        while True:
+            try:
+                self._chunks.get_nowait()
+                self._chunks.task_done()
+            except queue.Empty:
+                break
+        self._chunks.put(None)
@@ -0,0 +1,67 @@
+"""
+Transcription quality metrics: word/character error rate via edit distance.
+"""
+
+import re
+import unicodedata
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+
+
+def normalize_text(text):
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+def align(ref, hyp):
+    """
+    Levenshtein alignment of two token sequences.
+    Returns a list of (op, ref_token, hyp_token) with op in {"equal", "sub", "del", "ins"}.
+    """
+    n, m = len(ref), len(hyp)
+    # dist[i][j] = edit distance between ref[:i] and hyp[:j]
+    dist = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        dist[i][0] = i
+    for j in range(m + 1):
+        dist[0][j] = j
+    for i in range(1, n + 1):
+        row, prev = dist[i], dist[i - 1]
+        r = ref[i - 1]
+        for j in range(1, m + 1):
+            cost = 0 if r == hyp[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+
+    ops = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and dist[i][j] == dist[i - 1][j - 1] + (ref[i - 1] != hyp[j - 1]):
+            ops.append(("equal" if ref[i - 1] == hyp[j - 1] else "sub", ref[i - 1], hyp[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and dist[i][j] == dist[i - 1][j] + 1:
+            ops.append(("del", ref[i - 1], ""))
+            i -= 1
+        else:
+            ops.append(("ins", "", hyp[j - 1]))
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def _error_rate(ref_tokens, hyp_tokens):
+    if not ref_tokens:
+        return 0.0 if not hyp_tokens else 1.0
+    errors = sum(1 for op, _, _ in align(ref_tokens, hyp_tokens) if op != "equal")
+    return errors / len(ref_tokens)
+
+
+def wer(reference, hypothesis):
+    """Word error rate of hypothesis against reference (after normalization)."""
+    return _error_rate(normalize_text(reference).split(), normalize_text(hypothesis).split())
+
+
+def cer(reference, hypothesis):
+    """Character error rate of hypothesis against reference (after normalization)."""
+    return _error_rate(list(normalize_text(reference)), list(normalize_text(hypothesis)))
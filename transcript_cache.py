@@ -0,0 +1,109 @@
+"""
+Content-addressed on-disk cache of transcriptions.
+
+Entries are keyed by a hash of the decoded PCM plus the decoding config, so the
+same audio (even renamed or re-forwarded) is only transcribed once per config.
+The cache is size-bounded; the least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from transcription_daemon import Segment, TranscriptionInfo
+
+CACHE_DIR = os.environ.get(
+    "VOICE2CHATGPT_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "voice2chatgpt", "transcripts")
+)
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+SAMPLE_RATE = 16000
+
+
+def cache_key(audio, model_size, compute_type, beam_size, best_of, language=None):
+    config = json.dumps([model_size, compute_type, beam_size, best_of, language])
+    digest = hashlib.sha256(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    digest.update(config.encode())
+    return digest.hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def load(key):
+    """Return (segments, info) for a cached key, or None on a miss."""
+    path = _entry_path(key)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    os.utime(path)  # mark as recently used for LRU eviction
+    return [Segment(*s) for s in data["segments"]], TranscriptionInfo(**data["info"])
+
+
+def store(key, segments, info):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    data = {
+        "segments": [[seg.start, seg.end, seg.text] for seg in segments],
+        "info": {"language": info.language, "duration": info.duration},
+    }
+    path = _entry_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    evict()
+
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith(".json"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def cached_transcribe(audio, transcribe_fn, model_size, compute_type, beam_size=1, best_of=1, language=None):
+    """
+    Return (segments, info, hit). `audio` is a file path or a float32 array; files are
+    decoded once here and the array is what gets hashed and handed to transcribe_fn.
+    On a miss `segments` is lazy like faster-whisper's, and is cached once fully consumed.
+    """
+    if isinstance(audio, str):
+        from faster_whisper.audio import decode_audio
+
+        audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+    key = cache_key(audio, model_size, compute_type, beam_size, best_of, language)
+    cached = load(key)
+    if cached is not None:
+        return cached[0], cached[1], True
+    segments, info = transcribe_fn(audio, beam_size=beam_size, best_of=best_of)
+    info = TranscriptionInfo(info.language, info.duration)
+    return _store_when_done(key, segments, info), info, False
+
+
+def _store_when_done(key, segments, info):
+    """Pass segments through as they are decoded; cache them once the last one arrives."""
+    collected = []
+    for seg in segments:
+        seg = Segment(seg.start, seg.end, seg.text)
+        collected.append(seg)
+        yield seg
+    store(key, collected, info)
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Persistent transcription daemon: loads the Whisper model once and serves
+transcription requests over a Unix socket, so dictations skip the model load.
+
+One model is shared by every client: requests wait in a bounded priority
+queue (dictations before batch jobs) and up to --workers of them decode at
+once on the same weights. When the queue is full, clients are told to retry
+later instead of loading their own copy of the model.
+
+USAGE:
+  python3 transcription_daemon.py            # Start the daemon (foreground)
+  python3 transcription_daemon.py --workers 2 --max-queue 16 --shared
+                                             # 2 concurrent decodes; socket usable by the user's group
+  python3 transcription_daemon.py --stop     # Ask a running daemon to exit
+  python3 transcription_daemon.py --status   # Check whether the daemon is up
+  python3 transcription_daemon.py --metrics  # Queue depth, rejections and latency percentiles
+
+Protocol: one JSON line per request, one JSON line per response.
+A request may be followed by raw float32 PCM (16 kHz mono) when it sets
+"pcm_bytes", which lets the recorder hand audio over without a WAV file.
+A transcribe request with "stream": true gets the info line first, then one
+{"segment": [start, end, text]} line per decoded segment, then {"done": true}.
+"priority" is "interactive" (default) or "batch". A full queue answers
+{"ok": false, "busy": true, "retry_after": seconds}.
+"""
+
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+from inference_profile import select_profile
+
+SOCKET_PATH = os.environ.get("VOICE2CHATGPT_SOCKET", "/tmp/voice2chatgpt_whisper.sock")
+CONNECT_TIMEOUT = 0.2  # seconds, keeps the fallback path cheap when no daemon runs
+PRIORITIES = {"interactive": 0, "batch": 1}  # lower is served first
+MAX_QUEUE = 16
+INTERACTIVE_RESERVE = 4  # queue slots batch jobs can never take, so dictations still get in
+BUSY_WAIT_SEC = 30  # how long a client keeps retrying a full queue
+METRICS_WINDOW = 200  # latencies kept per priority for percentiles
+
+Segment = namedtuple("Segment", ["start", "end", "text"])
+TranscriptionInfo = namedtuple("TranscriptionInfo", ["language", "duration"])
+
+
+class DaemonUnavailable(Exception):
+    """Raised when the daemon is not running or cannot serve the request."""
+
+
+class DaemonBusy(DaemonUnavailable):
+    """Raised when the daemon's queue stayed full. Loading a local model instead may exhaust the GPU."""
+
+
+# === Client side ===
+
+def _open_request(request, pcm=None, timeout=None):
+    """Connect, send one request (plus optional PCM payload) and return (sock, reader)."""
+    if not os.path.exists(SOCKET_PATH):
+        raise DaemonUnavailable("no socket")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(SOCKET_PATH)
+        except OSError as e:
+            raise DaemonUnavailable(str(e))
+        sock.settimeout(timeout)
+        payload = b""
+        if pcm is not None:
+            payload = pcm.astype("float32", copy=False).tobytes()
+            request = dict(request, pcm_bytes=len(payload))
+        sock.sendall(json.dumps(request).encode() + b"\n" + payload)
+        return sock, sock.makefile("rb")
+    except BaseException:
+        sock.close()
+        raise
+
+
+def _read_response(reader):
+    line = reader.readline()
+    if not line:
+        raise DaemonUnavailable("daemon closed the connection")
+    response = json.loads(line)
+    if response.get("busy"):
+        error = DaemonBusy(response.get("error", "queue full"))
+        error.retry_after = response.get("retry_after", 1.0)
+        raise error
+    if not response.get("ok"):
+        raise DaemonUnavailable(response.get("error", "unknown daemon error"))
+    return response
+
+
+def _send_request(request, pcm=None, timeout=None):
+    """Send one request (plus optional PCM payload) and return the decoded response."""
+    sock, reader = _open_request(request, pcm, timeout)
+    try:
+        return _read_response(reader)
+    finally:
+        reader.close()
+        sock.close()
+
+
+def _stream_segments(sock, reader):
+    try:
+        while True:
+            response = _read_response(reader)
+            if response.get("done"):
+                return
+            yield Segment(*response["segment"])
+    finally:
+        reader.close()
+        sock.close()
+
+
+def daemon_status():
+    """Return the daemon's model config dict, or None if it is not running."""
+    try:
+        return _send_request({"cmd": "ping"}, timeout=2)
+    except (DaemonUnavailable, OSError, ValueError):
+        return None
+
+
+def daemon_transcribe(audio, model_size, compute_type, beam_size=1, best_of=1, stream=False,
+                      priority="interactive", busy_wait=BUSY_WAIT_SEC):
+    """
+    Transcribe `audio` (a file path or a float32 NumPy array) with the daemon.
+    Returns (segments, info) shaped like faster-whisper's output: a list of
+    Segment and a TranscriptionInfo. Raises DaemonUnavailable on any mismatch.
+    With stream=True, segments is a generator yielding each one as the daemon decodes it.
+    A full queue is retried for up to busy_wait seconds, then DaemonBusy is raised.
+    """
+    request = {
+        "cmd": "transcribe",
+        "model_size": model_size,
+        "compute_type": compute_type,
+        "beam_size": beam_size,
+        "best_of": best_of,
+        "priority": priority,
+    }
+    pcm = None
+    if isinstance(audio, str):
+        request["path"] = os.path.abspath(audio)
+    else:
+        pcm = audio
+    deadline = time.time() + busy_wait
+    while True:
+        try:
+            return _transcribe_once(request, pcm, stream)
+        except DaemonBusy as e:
+            if time.time() + e.retry_after > deadline:
+                raise
+            time.sleep(e.retry_after)
+
+
+def _transcribe_once(request, pcm, stream):
+    if stream:
+        request["stream"] = True
+        try:
+            sock, reader = _open_request(request, pcm=pcm)
+        except (OSError, ValueError) as e:
+            raise DaemonUnavailable(str(e))
+        try:
+            response = _read_response(reader)
+        except BaseException:
+            reader.close()
+            sock.close()
+            raise
+        return _stream_segments(sock, reader), TranscriptionInfo(**response["info"])
+    try:
+        response = _send_request(request, pcm=pcm)
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(str(e))
+    segments = [Segment(*s) for s in response["segments"]]
+    return segments, TranscriptionInfo(**response["info"])
+
+
+# === Server side ===
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.dispatch(request, self.rfile, self.wfile)
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        try:
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+        except OSError:
+            pass  # client went away (e.g. cancelled a streamed transcription)
+
+
+class _Job:
+    """One queued transcription; the handler thread waits on `done` for the worker's response."""
+
+    def __init__(self, request, audio, wfile):
+        self.request = request
+        self.audio = audio
+        self.wfile = wfile
+        self.priority = request.get("priority", "interactive")
+        self.enqueued = time.time()
+        self.done = threading.Event()
+        self.response = None
+
+
+class ServiceMetrics:
+    """Counters and recent latencies per priority, for --metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queued = dict.fromkeys(PRIORITIES, 0)
+        self.served = dict.fromkeys(PRIORITIES, 0)
+        self.rejected = dict.fromkeys(PRIORITIES, 0)
+        self.failed = dict.fromkeys(PRIORITIES, 0)
+        self.waits = {p: deque(maxlen=METRICS_WINDOW) for p in PRIORITIES}
+        self.decodes = {p: deque(maxlen=METRICS_WINDOW) for p in PRIORITIES}
+        self.audio_seconds = 0.0
+        self.started = time.time()
+
+    def average_decode(self):
+        recent = [d for p in PRIORITIES for d in self.decodes[p]]
+        return sum(recent) / len(recent) if recent else 1.0
+
+    def snapshot(self, in_flight, workers):
+        from session_trace import percentile
+
+        def _stats(values):
+            values = sorted(values)
+            return {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+
+        with self.lock:
+            return {
+                "uptime": time.time() - self.started,
+                "workers": workers,
+                "in_flight": in_flight,
+                "queued": dict(self.queued),
+                "served": dict(self.served),
+                "rejected": dict(self.rejected),
+                "failed": dict(self.failed),
+                "audio_seconds": self.audio_seconds,
+                "queue_wait": {p: _stats(self.waits[p]) for p in PRIORITIES},
+                "decode": {p: _stats(self.decodes[p]) for p in PRIORITIES},
+            }
+
+
+class TranscriptionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, model_size, device, compute_type, cpu_threads=0, num_workers=1,
+                 max_queue=MAX_QUEUE, socket_mode=0o600):
+        from faster_whisper import WhisperModel
+
+        if max_queue <= INTERACTIVE_RESERVE:
+            raise ValueError(f"max_queue must be more than INTERACTIVE_RESERVE ({INTERACTIVE_RESERVE})")
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.num_workers = num_workers
+        self.max_queue = max_queue
+        print(f"🧠 Loading Whisper {model_size} ({device}/{compute_type}, {num_workers} concurrent decodes)...")
+        load_start = time.time()
+        # One copy of the weights; CTranslate2 runs num_workers decodes on it concurrently
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                                  cpu_threads=cpu_threads, num_workers=num_workers)
+        print(f"✅ Model loaded in {time.time() - load_start:.2f}s")
+        self.jobs = queue.PriorityQueue()
+        self._sequence = itertools.count()  # FIFO order within a priority
+        self.metrics = ServiceMetrics()
+        self.in_flight = 0
+        for i in range(num_workers):
+            threading.Thread(target=self._worker, daemon=True, name=f"decode-{i}").start()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, socket_mode)
+
+    def dispatch(self, request, rfile, wfile):
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            with self.metrics.lock:
+                queued = sum(self.metrics.queued.values())
+            return {"ok": True, "model_size": self.model_size, "device": self.device,
+                    "compute_type": self.compute_type, "pid": os.getpid(),
+                    "workers": self.num_workers, "queued": queued, "in_flight": self.in_flight}
+        if cmd == "metrics":
+            return dict(self.metrics.snapshot(self.in_flight, self.num_workers), ok=True)
+        if cmd == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if cmd == "transcribe":
+            return self._transcribe(request, rfile, wfile)
+        return {"ok": False, "error": f"unknown command: {cmd}"}
+
+    def _admit(self, priority):
+        """Reserve a queue slot, or return the busy response (backpressure)."""
+        with self.metrics.lock:
+            queued = sum(self.metrics.queued.values())
+            limit = self.max_queue if priority == "interactive" else self.max_queue - INTERACTIVE_RESERVE
+            if queued < limit:
+                self.metrics.queued[priority] += 1
+                return None
+            self.metrics.rejected[priority] += 1
+            retry_after = max(0.5, (queued + self.in_flight) * self.metrics.average_decode() / self.num_workers)
+        return {"ok": False, "busy": True, "error": f"queue full ({queued} waiting)",
+                "retry_after": round(retry_after, 2)}
+
+    def _transcribe(self, request, rfile, wfile):
+        if (request.get("model_size"), request.get("compute_type")) != (self.model_size, self.compute_type):
+            return {"ok": False, "error": f"daemon serves {self.model_size}/{self.compute_type}"}
+        if request.get("priority", "interactive") not in PRIORITIES:
+            return {"ok": False, "error": f"unknown priority: {request['priority']}"}
+        if "pcm_bytes" in request:
+            import numpy as np
+            audio = np.frombuffer(rfile.read(request["pcm_bytes"]), dtype=np.float32)
+        else:
+            audio = request["path"]
+        job = _Job(request, audio, wfile)
+        busy = self._admit(job.priority)
+        if busy:
+            return busy
+        self.jobs.put((PRIORITIES[job.priority], next(self._sequence), job))
+        job.done.wait()
+        return job.response
+
+    def _worker(self):
+        while True:
+            _, _, job = self.jobs.get()
+            start = time.time()
+            with self.metrics.lock:
+                self.metrics.queued[job.priority] -= 1
+                self.metrics.waits[job.priority].append(start - job.enqueued)
+                self.in_flight += 1
+            try:
+                job.response = self._decode(job)
+                failed = False
+            except Exception as e:
+                job.response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                failed = True
+            elapsed = time.time() - start
+            with self.metrics.lock:
+                self.in_flight -= 1
+                if failed:
+                    self.metrics.failed[job.priority] += 1
+                else:
+                    self.metrics.served[job.priority] += 1
+                    self.metrics.decodes[job.priority].append(elapsed)
+            print(f"📝 Served {job.priority} request in {elapsed:.2f}s (waited {start - job.enqueued:.2f}s)")
+            job.done.set()
+
+    def _decode(self, job):
+        request = job.request
+        segments, info = self.model.transcribe(
+            job.audio, beam_size=request.get("beam_size", 1), best_of=request.get("best_of", 1)
+        )
+        info = {"duration": info.duration, "language": info.language}
+        if request.get("stream"):
+            self._stream(segments, info, job.wfile)
+            result = {"ok": True, "done": True}
+        else:
+            result = {"ok": True, "segments": [[seg.start, seg.end, seg.text] for seg in segments], "info": info}
+        with self.metrics.lock:
+            self.metrics.audio_seconds += info["duration"] or 0
+        return result
+
+    def _stream(self, segments, info, wfile):
+        """Write each segment as soon as the model yields it. Returns the segment count."""
+        wfile.write(json.dumps({"ok": True, "info": info}).encode() + b"\n")
+        count = 0
+        for seg in segments:
+            wfile.write(json.dumps({"ok": True, "segment": [seg.start, seg.end, seg.text]}).encode() + b"\n")
+            wfile.flush()
+            count += 1
+        return count
+
+
+def serve(socket_path=SOCKET_PATH, workers=None, max_queue=MAX_QUEUE, shared=False):
+    profile = select_profile()
+    server = TranscriptionServer(socket_path, profile["model_size"], profile["device"], profile["compute_type"],
+                                 profile["cpu_threads"], workers or profile["num_workers"], max_queue,
+                                 0o660 if shared else 0o600)
+    print(f"🎧 Listening on {socket_path} (queue of {max_queue}, Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        print("\n👋 Daemon stopped.")
+
+
+def print_metrics(metrics):
+    print(f"⏱️ Up {metrics['uptime'] / 60:.0f} min, {metrics['workers']} workers, "
+          f"{metrics['in_flight']} decoding, {metrics['audio_seconds']:.0f}s of audio served")
+    print(f"{'Priority':<12} {'Queued':>6} {'Served':>7} {'Rejected':>8} {'Failed':>6} "
+          f"{'Wait p50':>9} {'Wait p95':>9} {'Decode p50':>11} {'Decode p95':>11}")
+    for p in PRIORITIES:
+        wait, decode = metrics["queue_wait"][p], metrics["decode"][p]
+        print(f"{p:<12} {metrics['queued'][p]:>6} {metrics['served'][p]:>7} {metrics['rejected'][p]:>8} "
+              f"{metrics['failed'][p]:>6} {wait['p50']:>8.2f}s {wait['p95']:>8.2f}s "
+              f"{decode['p50']:>10.2f}s {decode['p95']:>10.2f}s")
+
+
+def main():
+    if "--status" in sys.argv:
+        status = daemon_status()
+        if status:
+            print(f"✅ Daemon running (pid {status['pid']}): "
+                  f"{status['model_size']} on {status['device']}/{status['compute_type']}, "
+                  f"{status.get('in_flight', 0)} decoding, {status.get('queued', 0)} queued")
+        else:
+            print("❌ Daemon not running.")
+        return
+    if "--metrics" in sys.argv:
+        try:
+            print_metrics(_send_request({"cmd": "metrics"}, timeout=2))
+        except DaemonUnavailable:
+            print("❌ Daemon not running.")
+        return
+    if "--stop" in sys.argv:
+        try:
+            _send_request({"cmd": "stop"}, timeout=2)
+            print("👋 Stop requested.")
+        except DaemonUnavailable:
+            print("❌ Daemon not running.")
+        return
+    args = sys.argv[1:]
+    options = {}
+    for flag in ("--workers", "--max-queue"):
+        if flag in args:
+            idx = args.index(flag)
+            value = args[idx + 1] if idx + 1 < len(args) else ""
+            if not value.isdigit() or int(value) < 1:
+                print(f"❌ {flag} needs a positive number.")
+                print(__doc__)
+                return 1
+            options[flag] = int(value)
+    if options.get("--max-queue", MAX_QUEUE) <= INTERACTIVE_RESERVE:
+        print(f"❌ --max-queue must be more than {INTERACTIVE_RESERVE} (queue slots kept for dictations).")
+        return 1
+    serve(workers=options.get("--workers"), max_queue=options.get("--max-queue", MAX_QUEUE),
+          shared="--shared" in args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Energy-based voice activity detection used to drop silence before decoding.
+
+Works on per-block RMS values (the recorder already computes one per
+PortAudio block). The silence threshold follows the recording's own noise
+floor, so a low-gain microphone does not lose its speech, and keeps a little padding around speech so word edges
+survive, and returns a TimeMap to translate timestamps of the trimmed audio
+back to the original recording.
+"""
+
+import numpy as np
+
+SILENCE_RMS = 0.01        # blocks at least this loud always count as speech (~ -40 dBFS)
+MIN_SILENCE_RMS = 0.001   # the silence threshold never goes below this (~ -60 dBFS)
+NOISE_PERCENTILE = 10     # block RMS percentile taken as the noise floor
+NOISE_MARGIN = 4.0        # speech is this far above the noise floor (+12 dB)
+PAD_SEC = 0.25        # audio kept on each side of detected speech
+MIN_GAP_SEC = 0.6     # shorter pauses are kept as-is (natural speech rhythm)
+ANALYSIS_BLOCK = 512  # frames per block when no recorder RMS is available
+
+
+def block_rms(audio, block_size=ANALYSIS_BLOCK):
+    """Return (rms, lengths) for consecutive blocks of a mono array."""
+    n_full = len(audio) // block_size
+    rms = np.sqrt(np.mean(audio[:n_full * block_size].reshape(n_full, block_size) ** 2, axis=1))
+    lengths = np.full(n_full, block_size, dtype=np.int64)
+    tail = audio[n_full * block_size:]
+    if len(tail):
+        rms = np.append(rms, np.sqrt(np.mean(tail ** 2)))
+        lengths = np.append(lengths, len(tail))
+    return rms, lengths
+
+
+def _runs(mask, value):
+    """Return (starts, ends) of runs where mask == value."""
+    padded = np.concatenate(([not value], mask == value, [not value])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[::2], edges[1::2]
+
+
+def silence_threshold(rms):
+    """Block RMS below which a block is silence: NOISE_MARGIN above the noise floor,
+    clamped to [MIN_SILENCE_RMS, SILENCE_RMS] so quiet recordings keep their speech."""
+    if not len(rms):
+        return SILENCE_RMS
+    floor = float(np.percentile(rms, NOISE_PERCENTILE))
+    return min(SILENCE_RMS, max(MIN_SILENCE_RMS, floor * NOISE_MARGIN))
+
+
+def keep_mask(rms, lengths, sample_rate, threshold=None, pad_sec=PAD_SEC, min_gap_sec=MIN_GAP_SEC):
+    """Boolean mask of blocks to keep: speech, padding around it, and short pauses.
+    threshold defaults to silence_threshold(rms)."""
+    rms = np.asarray(rms)
+    speech = rms >= (silence_threshold(rms) if threshold is None else threshold)
+    if not speech.any():
+        return speech
+    block_sec = float(np.mean(lengths)) / sample_rate
+    pad_blocks = int(np.ceil(pad_sec / block_sec))
+    # mode="full" + slice: "same" returns the kernel length when there are fewer blocks than the kernel
+    padded = np.convolve(speech.astype(np.int32), np.ones(2 * pad_blocks + 1, dtype=np.int32), mode="full")
+    keep = padded[pad_blocks:pad_blocks + len(speech)] > 0
+    # Re-fill interior gaps that are too short to be worth cutting
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    starts, ends = _runs(keep, False)
+    gap_sec = (bounds[ends] - bounds[starts]) / sample_rate
+    short = (starts > 0) & (ends < len(keep)) & (gap_sec < min_gap_sec)
+    for start, end in zip(starts[short], ends[short]):
+        keep[start:end] = True
+    return keep
+
+
+class TimeMap:
+    """Maps times in trimmed audio back to times in the original audio."""
+
+    def __init__(self, trimmed_starts, original_starts):
+        self.trimmed_starts = np.asarray(trimmed_starts, dtype=np.float64)
+        self.original_starts = np.asarray(original_starts, dtype=np.float64)
+
+    def to_original(self, t):
+        if not len(self.trimmed_starts):
+            return t
+        i = max(0, int(np.searchsorted(self.trimmed_starts, t, side="right")) - 1)
+        return float(self.original_starts[i] + (t - self.trimmed_starts[i]))
+
+
+def trim_silence(audio, sample_rate, rms=None, lengths=None):
+    """
+    Drop silent spans from a mono float32 array.
+    Returns (trimmed_audio, time_map, skipped_seconds). Pass the recorder's per-block
+    `rms` and `lengths` to avoid recomputing them.
+    """
+    if rms is None:
+        rms, lengths = block_rms(audio)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    keep = keep_mask(rms, lengths, sample_rate)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    starts, ends = _runs(keep, True)
+    pieces = [audio[bounds[s]:bounds[e]] for s, e in zip(starts, ends)]
+    trimmed = np.concatenate(pieces) if pieces else audio[:0]
+    piece_lengths = np.array([len(p) for p in pieces], dtype=np.int64)
+    trimmed_starts = np.concatenate(([0], np.cumsum(piece_lengths)[:-1])) / sample_rate if pieces else []
+    time_map = TimeMap(trimmed_starts, bounds[starts] / sample_rate)
+    skipped = (len(audio) - len(trimmed)) / sample_rate
+    return trimmed, time_map, skipped
@@ -1,57 +1,96 @@
+# Heavy modules (faster_whisper, pyautogui, pynput, requests) are imported where they are
+# used, so recording starts before they finish loading (see warm_up()).
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
 import os
 import threading
-import queue
 import time
 import webbrowser
 import pyperclip
-import pyautogui
 import subprocess
-import requests
-import json
-from pynput import keyboard as pynput_keyboard
-from faster_whisper import WhisperModel
+import sqlite3
 from playsound import playsound
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import partial
+from transcription_daemon import DaemonBusy, DaemonUnavailable, Segment, daemon_status, daemon_transcribe
+from streaming_transcriber import StreamingTranscriber
+from batch_transcriber import discover_audio_files, run_batch
+from transcript_cache import cached_transcribe
+from inference_profile import chunk_workers, select_profile
+from vad import trim_silence
+from ring_recorder import RingBufferRecorder
+from level_meter import LevelMeter
+from recording_session import RecordingSession, start_key_listener
+from audio_archive import (ARCHIVE_FORMATS, archive_recording_async, audio_filename,
+                           find_recording_audio, save_audio_async, wait_for_pending_saves)
+from audio_preprocess import load_audio
+from audio_probe import probe_duration
+from segment_output import SegmentWriter
+from long_form import transcribe_long
+import recordings_index
+import session_trace
+from text_metrics import align, normalize_text, wer
 
 # === CONFIG ===
 SAMPLE_RATE = 16000
 CHANNELS = 1
-MODEL_SIZE = "medium"
-DEVICE = "cuda"
-COMPUTE_TYPE = "float16"
+BLOCK_SIZE = 512  # frames per PortAudio callback (32 ms), also the VAD granularity
+# Set by init_profile(): cuda/float16/medium with a GPU, tuned int8 CPU profile otherwise.
+# Probing imports CTranslate2, so it happens in the background while recording.
+PROFILE = None
+MODEL_SIZE = None
+DEVICE = None
+COMPUTE_TYPE = None
 MIC_BAR_WIDTH = 30
+SHOW_LEVEL_METER = True  # drawn by a UI thread, only on an interactive terminal (never under the launcher)
 CHATGPT_ICON_IMAGE = "assets/chatgpt_plus.jpeg"
 OLLAMA_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "gemma:2b"
+STREAM_WHILE_RECORDING = True  # decode finished chunks while the user is still talking
+TRIM_SILENCE = True  # drop silent spans of recordings before they reach Whisper
+ARCHIVE_FORMAT = "wav"  # "wav", "flac" or "opus"; written in the background after recording
+COMPRESS_FORMAT = "opus"  # WAVs are transcoded to "opus" or "flac" in the background after transcription (None: off)
+KEEP_WAV_DAYS = 30  # compressed recordings lose their WAV after this many days (None: keep WAVs forever)
+LONG_FORM_MIN_SEC = 300  # files at least this long are split at pauses and decoded in parallel chunks
+DRAFT_MODE = False  # --draft: paste a fast draft, then refine with MODEL_SIZE in the background
+DRAFT_MODEL_SIZE = "tiny"
+DRAFT_COMPUTE_TYPE = "int8"
+PREPROCESS_NORMALIZE = True  # imported files: bring speech to a steady level before decoding
+PREPROCESS_HIGHPASS_HZ = None  # e.g. 80 to cut rumble below 80 Hz in imported files (None: off)
 
 # === Globals ===
-recording = True
-duration_sec = 0
-start_time = None
-action_chosen = None
-callback_enabled = True
-RECORDING_FILENAME = "recorded.wav"  # fallback only
-TRANSCRIPTION_FILENAME = "transcription.txt"
-current_audio_path = None
-current_transcript_path = None
-
-
-def generate_paths():
+# Per-dictation state (recorder, timings, paths, chosen action) lives in a RecordingSession
+_model = None  # in-process fallback when the transcription daemon is not running
+_draft_model = None
+_daemon_served = False  # set once the daemon answered a transcription: warm-up then skips the local load
+_model_lock = threading.Lock()
+_profile_lock = threading.Lock()
+_llm_client = None
+_icon_locator = None  # loads the template once per process
+# Sounds, transcript writes and stats run here so they never delay the paste
+_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="post-transcription")
+_pending_background = set()  # main() waits for these: the pool refuses new work once the interpreter exits
+_pending_lock = threading.Lock()
+
+
+def generate_paths(session):
     now = datetime.now()
     base_folder = os.path.join("recordings", now.strftime("%Y-%m-%d"), now.strftime("%H-%M-%S"))
     os.makedirs(base_folder, exist_ok=True)
-    global current_audio_path, current_transcript_path
-    current_audio_path = os.path.join(base_folder, "audio.wav")
-    current_transcript_path = os.path.join(base_folder, "transcript.txt")
-    return current_audio_path
+    session.audio_path = os.path.join(base_folder, audio_filename(ARCHIVE_FORMAT))
+    session.transcript_path = os.path.join(base_folder, "transcript.txt")
+    session.trace.attach(base_folder)
+    return session.audio_path
+
+
+def jsonl_path_for(transcript_path):
+    return os.path.splitext(transcript_path)[0] + ".jsonl"
 
 
 SUPPORTED_AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.m4a', '.flac', '.opus'}
-QUICK_MODE_DISCLAIMER = f"[Transcribed with Whisper {MODEL_SIZE} - may contain errors] "
+QUICK_MODE_DISCLAIMER = "[Transcribed with Whisper {model} - may contain errors] "
 
 
 def print_help():
@@ -62,6 +101,24 @@ USAGE:
   python3 voice_transcriber.py                   # Start recording interactively
   python3 voice_transcriber.py --quick           # Quick mode: record, transcribe, paste at cursor + Enter
   python3 voice_transcriber.py <audio_file>      # Transcribe existing file (no recording)
+  python3 voice_transcriber.py recordings/<day>/<time>
+                                                 # Re-transcribe an archived recording (WAV, FLAC or Opus)
+  python3 voice_transcriber.py --no-stream       # Only transcribe after recording stops
+  python3 voice_transcriber.py --quick --draft   # Paste a tiny-model draft at once, refine in the background
+  python3 voice_transcriber.py --batch <dir|glob> [--workers N] [--replicas N]
+                                                 # Transcribe many files, writing <name>.txt next to each
+  python3 voice_transcriber.py <audio_file> --no-cache
+                                                 # Ignore cached transcripts of already-seen audio
+  python3 voice_transcriber.py <audio_file> --type
+                                                 # Type each segment at the cursor as it is decoded
+  python3 voice_transcriber.py ... --jsonl       # Also write segments with timestamps (transcript.jsonl)
+  python3 voice_transcriber.py <long_file> --workers N
+                                                 # Files over 5 min are decoded in N parallel chunks
+  python3 voice_transcriber.py --search <words>  # Full-text search of past transcripts
+  python3 voice_transcriber.py --reindex         # Sync the search index with recordings/
+  python3 audio_preprocess.py <file|dir> [--workers N]
+                                                 # Convert to normalized 16 kHz mono WAV (replaces audio_to_wav.sh)
+  python3 session_trace.py [--days N]            # Per-stage latency report (p50/p95) of past dictations
   python3 voice_transcriber.py --help            # Show this help message
 
 SUPPORTED FORMATS:
@@ -82,27 +139,17 @@ MODES:
 """)
 
 
-def audio_callback(indata, frames, time_info, status):
-    global callback_enabled
-    if not callback_enabled:
-        return
-    volume_norm = np.linalg.norm(indata) / len(indata)
-    level = min(int(volume_norm * 100 * MIC_BAR_WIDTH), MIC_BAR_WIDTH)
-    bar = "█" * level + " " * (MIC_BAR_WIDTH - level)
-    elapsed = time.time() - start_time if start_time else 0
-    print(f"\r🎤 {elapsed:5.1f}s [{bar}]", end="", flush=True)
-
-
-def record_audio(filename, quick_mode=False):
-    global duration_sec, recording, callback_enabled, start_time
-    q = queue.Queue()
-
-    def _callback(indata, frames, time_info, status):
-        q.put(indata.copy())
-        audio_callback(indata, frames, time_info, status)
-
-    with sf.SoundFile(filename, mode='w', samplerate=SAMPLE_RATE, channels=CHANNELS) as file:
-        with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=_callback):
+def record_audio(session, filename, quick_mode=False, streamer=None):
+    """Record until session.stop() is called. The PCM stays in memory for the transcriber;
+    `filename` is written in the background once recording stops."""
+    trace = session.trace
+    open_start = time.time()
+    recorder = session.recorder = RingBufferRecorder(SAMPLE_RATE, CHANNELS,
+                                                     on_block=streamer.feed if streamer else None)
+    recorder.start()
+    try:
+        with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, blocksize=BLOCK_SIZE,
+                            callback=recorder.callback):
             playsound("sounds/plop.wav")
             print("\n🎤 Recording started.")
             if quick_mode:
@@ -117,88 +164,411 @@ def record_audio(filename, quick_mode=False):
                 print("📋 Text will always be copied to clipboard.\n")
 
             start_time = time.time()
+            session.mark_started(start_time)
+            trace.record("record_start", start_time - open_start, open_start)
+            trace.since_hotkey("hotkey_to_record", start_time)
+            meter = None
+            if SHOW_LEVEL_METER and LevelMeter.enabled():
+                meter = LevelMeter(recorder, MIC_BAR_WIDTH).start(start_time)
             try:
-                while recording:
-                    try:
-                        file.write(q.get(timeout=0.1))
-                    except queue.Empty:
-                        continue
+                session.wait_stopped()
             finally:
-                duration_sec = time.time() - start_time
-                callback_enabled = False
-                print("\r" + " " * (MIC_BAR_WIDTH + 20), end="\r", flush=True)
+                session.duration_sec = time.time() - start_time
+                trace.record("recording", session.duration_sec, start_time, overflows=recorder.overflows,
+                             dropped_frames=recorder.dropped_frames)
+                if meter:
+                    meter.stop()
                 print("\n🎤 Recording stopped.")
+    finally:
+        recorder.stop()
+    if recorder.overflows or recorder.dropped_frames:
+        print(f"⚠️ Input overflows: {recorder.overflows}, dropped frames: {recorder.dropped_frames}")
+    if recorder.frames_recorded:
+        save_audio_async(recorder.get_audio(), filename, SAMPLE_RATE, ARCHIVE_FORMAT,
+                         on_saved=lambda start, seconds: trace.record("save_audio", seconds, start))
+
+
+def get_icon_locator():
+    global _icon_locator
+    if _icon_locator is None:
+        from screen_locator import TemplateLocator
+
+        _icon_locator = TemplateLocator(CHATGPT_ICON_IMAGE, confidence=0.85)
+    return _icon_locator
 
 
 def focus_and_click_chatgpt_input(timeout=5):
+    import pyautogui
+
     try:
         print("🔍 Looking for '+' icon to focus input...")
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try :
-                location = pyautogui.locateOnScreen(CHATGPT_ICON_IMAGE, confidence=0.85)
-            except pyautogui.ImageNotFoundException:
-                time.sleep(0.2)
-                continue
-            if location:
-                center = pyautogui.center(location)
-                pyautogui.click(center.x, center.y - 40)
-                print("✅ Focused input box.")
+        locator = get_icon_locator()
+        search_start = time.time()
+        attempts = 0
+        while time.time() - search_start < timeout:
+            attempts += 1
+            center = locator.locate()
+            if center:
+                session_trace.current().record("locate_input", time.time() - search_start, search_start,
+                                               search=locator.last_stage, attempts=attempts)
+                pyautogui.click(center[0], center[1] - 40)
+                print(f"✅ Focused input box (located in {locator.last_latency * 1000:.0f} ms via "
+                      f"{locator.last_stage} search, attempt {attempts}).")
                 return True
-        print("❌ '+' icon not found.")
+            time.sleep(0.2)  # the page may still be loading
+        print(f"❌ '+' icon not found (last search took {locator.last_latency * 1000:.0f} ms).")
         return False
     except Exception as e:
         print(f"⚠️ Input focus failed: {e}")
         return False
 
 
-def transcribe_audio(filename):
-    playsound("sounds/beep.wav")
-    print("🧠 Transcribing...")
-    model = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE)
+def init_profile():
+    """Pick device, precision and model size (once per process)."""
+    global PROFILE, MODEL_SIZE, DEVICE, COMPUTE_TYPE
+    with _profile_lock:
+        if PROFILE is None:
+            profile = select_profile()
+            MODEL_SIZE = profile["model_size"]
+            DEVICE = profile["device"]
+            COMPUTE_TYPE = profile["compute_type"]
+            PROFILE = profile
+
+
+def warm_up(quick_mode=False, draft=False):
+    """
+    Runs while the user is talking: probe the device, import the modules needed after
+    recording and, unless a matching daemon is serving, load the model in-process
+    (the draft model first in draft mode).
+    """
+    init_profile()
+    if quick_mode:
+        import pyautogui  # noqa: F401  (used by the paste right after transcription)
+    if draft:
+        load_draft_model()
+    if not daemon_serves_model():
+        load_model(unless_daemon=True)
+
+
+def daemon_serves_model():
+    """True once a request was served by the daemon, or if a daemon with our model is up now."""
+    if _daemon_served:
+        return True
+    status = daemon_status()
+    return bool(status) and (status["model_size"], status["compute_type"]) == (MODEL_SIZE, COMPUTE_TYPE)
+
+
+def start_warm_up(quick_mode=False, draft=False):
+    thread = threading.Thread(target=warm_up, args=(quick_mode, draft), daemon=True, name="warm-up")
+    thread.start()
+    return thread
+
+
+def load_model(num_workers=1, cpu_threads=None, unless_daemon=False):
+    """Load the Whisper model in-process (once per process).
+    num_workers > 1 lets that many threads call transcribe() in parallel,
+    each using cpu_threads (default: the profile's).
+    With unless_daemon (warm-up), nothing is loaded if a daemon started serving meanwhile."""
+    global _model
+    init_profile()
+    with _model_lock:
+        if _model is not None:
+            return _model
+        if unless_daemon and daemon_serves_model():
+            return None
+        from faster_whisper import WhisperModel
+
+        load_start = time.time()
+        _model = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE,
+                              cpu_threads=PROFILE["cpu_threads"] if cpu_threads is None else cpu_threads,
+                              num_workers=max(num_workers, PROFILE["num_workers"]))
+        session_trace.current().record("model_load", time.time() - load_start, load_start, model=MODEL_SIZE)
+        print(f"🧠 Model loaded in {time.time() - load_start:.2f}s (run transcription_daemon.py to keep it warm)")
+    return _model
+
+
+def load_draft_model():
+    """Load the small draft model in-process (once per process)."""
+    global _draft_model
+    init_profile()
+    with _model_lock:
+        if _draft_model is not None:
+            return _draft_model
+        from faster_whisper import WhisperModel
+
+        load_start = time.time()
+        _draft_model = WhisperModel(DRAFT_MODEL_SIZE, device=DEVICE, compute_type=DRAFT_COMPUTE_TYPE,
+                                    cpu_threads=PROFILE["cpu_threads"])
+        session_trace.current().record("model_load", time.time() - load_start, load_start, model=DRAFT_MODEL_SIZE)
+    return _draft_model
+
+
+def run_draft_transcription(audio, beam_size=1, best_of=1):
+    return load_draft_model().transcribe(audio, beam_size=beam_size, best_of=best_of)
+
+
+def run_transcription(audio, beam_size=1, best_of=1, stream=False, priority="interactive"):
+    """
+    Transcribe with the warm daemon if it is running (see transcription_daemon.py),
+    otherwise load the model in this process.
+    stream=True makes daemon segments arrive as they are decoded (the local model always does).
+    priority="batch" lets dictations from other clients go first.
+    """
+    global _daemon_served
+    init_profile()
+    try:
+        segments, info = daemon_transcribe(audio, MODEL_SIZE, COMPUTE_TYPE, beam_size=beam_size, best_of=best_of,
+                                           stream=stream, priority=priority)
+        _daemon_served = True
+        print("⚡ Served by transcription daemon.")
+        return segments, info
+    except DaemonBusy:
+        if DEVICE == "cuda":
+            # A second copy of the weights next to the daemon's would likely run out of VRAM
+            raise
+        print("⏳ Transcription daemon busy, decoding locally.")
+    except DaemonUnavailable:
+        pass
+    model = load_model()
+    return model.transcribe(audio, beam_size=beam_size, best_of=best_of)
+
+
+def run_long_transcription(audio, beam_size=1, best_of=1, workers=None):
+    """Transcribe a long file in parallel chunks, on the daemon if it serves our model, else on a local model."""
+    init_profile()
+    status = daemon_status()
+    if status and (status["model_size"], status["compute_type"]) == (MODEL_SIZE, COMPUTE_TYPE):
+        workers = workers or status.get("workers", 1)
+        transcribe_fn = partial(daemon_transcribe, model_size=MODEL_SIZE, compute_type=COMPUTE_TYPE,
+                                priority="batch")
+        print(f"✂️ Long file: sending chunks cut at pauses to the daemon, {workers} at a time")
+    else:
+        workers, cpu_threads = chunk_workers(PROFILE, workers)
+        transcribe_fn = load_model(num_workers=workers, cpu_threads=cpu_threads).transcribe
+        print(f"✂️ Long file: decoding chunks cut at pauses, {workers} at a time")
+    return transcribe_long(audio, transcribe_fn, SAMPLE_RATE, workers, beam_size, best_of)
+
+
+def transcribe_recording_trimmed(audio, rms, lengths, transcribe_fn=run_transcription):
+    """Transcribe the in-memory recording with silent spans removed. Returns (segments, skipped_seconds).
+    rms/lengths are the recorder's per-block levels."""
+    trimmed, time_map, skipped = trim_silence(audio, SAMPLE_RATE, rms, lengths)
+    if not len(trimmed):
+        return [], skipped
+    segments, _ = transcribe_fn(trimmed, beam_size=1, best_of=1)
+    segments = [Segment(time_map.to_original(seg.start), time_map.to_original(seg.end), seg.text)
+                for seg in segments]
+    return segments, skipped
+
+
+def _report_background_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"\n⚠️ Background task failed: {future.exception()}")
+
+
+def _forget_background(future):
+    with _pending_lock:
+        _pending_background.discard(future)
+
+
+def run_in_background(fn, *args):
+    future = _background.submit(fn, *args)
+    with _pending_lock:
+        _pending_background.add(future)
+    future.add_done_callback(_report_background_error)
+    future.add_done_callback(_forget_background)
+    return future
+
+
+def wait_for_background():
+    """Block until post-transcription work has finished, including work it queued itself
+    (WAV expiry, draft refinement), so a one-shot run does not exit before it."""
+    while True:
+        with _pending_lock:
+            pending = list(_pending_background)
+        if not pending:
+            return
+        wait(pending)
+
+
+def play_sound_async(path):
+    return run_in_background(playsound, path)
+
+
+def transcribe_audio(session, audio, streamer=None, use_cache=False, on_text_ready=None, jsonl=False,
+                     type_text=False, workers=None, draft=False):
+    """
+    Transcribe a file path, or the float32 array of session's fresh recording (no WAV round-trip).
+    Segments are written to the transcript as they are decoded; for files they are also
+    printed, and with type_text typed at the cursor. jsonl adds transcript.jsonl with timestamps.
+    Files of LONG_FORM_MIN_SEC or more are decoded in parallel chunks (`workers` at a time).
+    If on_text_ready is given (quick mode), it is called as soon as the text exists, and
+    printing stats happens afterwards in the background.
+    With draft (recordings only), the text comes from DRAFT_MODEL_SIZE and is refined in the background.
+    """
+    play_sound_async("sounds/beep.wav")
+    init_profile()
+    trace = session.trace
+    echo = isinstance(audio, str) and on_text_ready is None
+    writer = SegmentWriter(session.transcript_path, jsonl_path_for(session.transcript_path) if jsonl else None,
+                           echo=echo, type_text=type_text)
     start = time.time()
-    segments, info = model.transcribe(filename, beam_size=1, best_of=1)
+    silence_skipped = None
+    info = None
+    if streamer:
+        print(f"🧠 Transcribing tail ({streamer.chunks_decoded} chunks already decoded while recording)...")
+        segments = streamer.finish()
+        if streamer.trim:
+            silence_skipped = streamer.silence_skipped_sec
+    elif isinstance(audio, np.ndarray):
+        print(f"🧠 Transcribing draft with {DRAFT_MODEL_SIZE}..." if draft else "🧠 Transcribing...")
+        decode_fn = run_draft_transcription if draft else run_transcription
+        if TRIM_SILENCE:
+            segments, silence_skipped = transcribe_recording_trimmed(audio, session.recorder.block_rms,
+                                                                     session.recorder.block_lengths, decode_fn)
+        else:
+            segments, info = decode_fn(audio, beam_size=1, best_of=1)
+    else:
+        print("🧠 Transcribing...")
+        with trace.span("preprocess", normalize=PREPROCESS_NORMALIZE, highpass_hz=PREPROCESS_HIGHPASS_HZ):
+            samples = load_audio(audio, SAMPLE_RATE, PREPROCESS_NORMALIZE, PREPROCESS_HIGHPASS_HZ)
+        if len(samples) >= LONG_FORM_MIN_SEC * SAMPLE_RATE:
+            transcribe_fn = partial(run_long_transcription, workers=workers)
+        else:
+            transcribe_fn = partial(run_transcription, stream=True)
+        if use_cache:
+            segments, info, hit = cached_transcribe(samples, transcribe_fn, MODEL_SIZE, COMPUTE_TYPE)
+            if hit:
+                print("♻️ Loaded from transcript cache.")
+        else:
+            segments, info = transcribe_fn(samples, beam_size=1, best_of=1)
+    text = writer.write_all(segments)
     end = time.time()
-    text = " ".join([seg.text for seg in segments])
+    stage_times = {"transcribe": end - start}
+    draft = draft and isinstance(audio, np.ndarray) and not streamer
+    trace.record("decode", end - start, start, model=DRAFT_MODEL_SIZE if draft else MODEL_SIZE,
+                 streamed=bool(streamer))
+    if session.start_time is not None:
+        stopped_at = session.start_time + session.duration_sec
+        trace.record("stop_to_text", end - stopped_at, stopped_at)
+    trace.since_hotkey("hotkey_to_text", end)
+
+    refine = None
+    if draft:
+        refine = partial(refine_transcription, audio, text, session.transcript_path, jsonl,
+                         session.recorder.block_rms, session.recorder.block_lengths, trace)
+
+    if on_text_ready:
+        # The callback puts its own text on the clipboard; copying here too would only add latency
+        stage_start = time.time()
+        on_text_ready(text)
+        stage_times["paste"] = time.time() - stage_start
+        trace.record("paste", stage_times["paste"], stage_start)
+        play_sound_async("sounds/plop.wav")
+        run_in_background(finish_transcription, session, audio, text, start, end, info, silence_skipped,
+                          stage_times, refine)
+    else:
+        stage_start = time.time()
+        pyperclip.copy(text)
+        stage_times["clipboard"] = time.time() - stage_start
+        trace.record("clipboard", stage_times["clipboard"], stage_start)
+        print("📋 Copied to clipboard.")
+        play_sound_async("sounds/plop.wav")
+        finish_transcription(session, audio, text, start, end, info, silence_skipped, stage_times, refine)
+    return text
 
-    pyperclip.copy(text)
-    print("📋 Copied to clipboard.")
-    playsound("sounds/plop.wav")
 
-    global duration_sec, current_transcript_path
-    if duration_sec == 0:
-        # For pre-recorded files, try to get duration via ffprobe (handles all formats)
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                 '-of', 'default=noprint_wrappers=1:nokey=1', filename],
-                capture_output=True, text=True
-            )
-            file_duration = float(result.stdout.strip())
-        except (ValueError, FileNotFoundError):
-            # Fallback: try soundfile (works for WAV)
-            try:
-                with sf.SoundFile(filename) as f:
-                    file_duration = len(f) / f.samplerate
-            except Exception:
-                file_duration = end - start  # Last resort: use transcription time
+def refine_transcription(audio, draft_text, transcript_path, jsonl, rms, lengths, trace):
+    """Re-decode a drafted recording with MODEL_SIZE, then update transcript, clipboard and index."""
+    refine_fn = partial(run_transcription, priority="batch")  # the user already has the draft
+    with trace.span("refine", model=MODEL_SIZE):
+        if TRIM_SILENCE:
+            segments, _ = transcribe_recording_trimmed(audio, rms, lengths, refine_fn)
+        else:
+            segments, _ = refine_fn(audio, beam_size=1, best_of=1)
+        writer = SegmentWriter(transcript_path, jsonl_path_for(transcript_path) if jsonl else None, echo=False)
+        text = writer.write_all(segments)
+
+    changes = [(d, r) for op, d, r in align(normalize_text(draft_text).split(), normalize_text(text).split())
+               if op != "equal"]
+    print(f"\n✨ Refined with {MODEL_SIZE}: {len(changes)} word changes "
+          f"(draft WER {wer(text, draft_text) * 100:.1f}%)")
+    for draft_word, refined_word in changes[:10]:
+        print(f"   {draft_word or '∅'} → {refined_word or '∅'}")
+    if len(changes) > 10:
+        print(f"   ... and {len(changes) - 10} more")
+    if not changes:
+        return text
+
+    # Only replace the clipboard if it still holds the draft (quick mode adds a disclaimer prefix)
+    if pyperclip.paste().endswith(draft_text):
+        pyperclip.copy(text)
+        print("📋 Clipboard updated with the refined text.")
+    folder = os.path.dirname(transcript_path)
+    try:
+        recordings_index.index_recording(folder, text, len(audio) / SAMPLE_RATE, MODEL_SIZE, COMPUTE_TYPE)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not update the recordings index: {e}")
+    return text
+
+
+def finish_transcription(session, audio, text, start, end, info, silence_skipped, stage_times, refine=None):
+    """Print stats (off the latency path in quick mode). The transcript is already saved.
+    `refine` (draft mode) is started afterwards so the index ends up with the refined text."""
+    if session.duration_sec == 0:
+        # For pre-recorded files, Whisper already measured the duration while decoding;
+        # otherwise read it from the container headers (ffprobe only as a last resort)
+        file_duration = info.duration if info is not None else probe_duration(audio)
+        if not file_duration:
+            file_duration = end - start  # Last resort: use transcription time
         rtf = (end - start) / file_duration if file_duration > 0 else 0
-        duration_sec = file_duration
+        session.duration_sec = file_duration
     else:
-        rtf = (end - start) / duration_sec
+        rtf = (end - start) / session.duration_sec
+    duration_sec = session.duration_sec
 
     print("\n📊 Stats:")
     print(f" - Input duration       : {duration_sec:.2f} seconds")
     print(f" - Real-time factor     : {rtf:.2f}x")
     print(f" - Transcription time   : {end - start:.2f} seconds")
+    if silence_skipped is not None:
+        skipped_pct = 100 * silence_skipped / duration_sec if duration_sec > 0 else 0
+        print(f" - Silence skipped      : {silence_skipped:.2f} seconds ({skipped_pct:.0f}%)")
     print(f" - Output text length   : {len(text)} characters")
-    print(f" - Saved to             : {current_transcript_path}")
-    with open(current_transcript_path, "w") as f:
-        f.write(text)
-    return text
+    if session.recorder is not None:
+        print(f" - Input overflows      : {session.recorder.overflows} "
+              f"({session.recorder.dropped_frames} frames dropped)")
+    print(" - Stage timings        : " + ", ".join(f"{k} {v:.2f}s" for k, v in stage_times.items()))
+    print(f" - Saved to             : {session.transcript_path}")
+    # A draft is indexed as the draft model's text until refine_transcription replaces it
+    model_size, compute_type = (DRAFT_MODEL_SIZE, DRAFT_COMPUTE_TYPE) if refine else (MODEL_SIZE, COMPUTE_TYPE)
+    try:
+        with session.trace.span("index"):
+            recordings_index.index_recording(os.path.dirname(session.transcript_path), text, duration_sec,
+                                             model_size, compute_type)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not update the recordings index: {e}")
+    if COMPRESS_FORMAT and session.audio_path.endswith(".wav"):
+        # Expiry runs in the same non-daemon thread: a one-shot run finishes it before exiting
+        archive_recording_async(os.path.dirname(session.audio_path), COMPRESS_FORMAT, KEEP_WAV_DAYS,
+                                expire_root="recordings")
+    if refine:
+        session.refine_future = run_in_background(refine)
+
+
+def settle_refinement(session, cancel=False):
+    """Cancel (if not started) or wait for the draft refinement before the folder is renamed or deleted."""
+    future = session.refine_future
+    if future is None or (cancel and future.cancel()):
+        return
+    if not future.done():
+        print("⏳ Waiting for the refinement to finish...")
+    wait([future])
 
 
 def send_to_existing_chatgpt(text):
+    import pyautogui
+
     print("📨 Focusing Firefox window...")
     try:
         subprocess.call(['xdotool', 'search', '--onlyvisible', '--class', 'firefox', 'windowactivate'])
@@ -214,6 +584,8 @@ def send_to_existing_chatgpt(text):
 
 
 def send_to_new_chatgpt(text):
+    import pyautogui
+
     print("🌐 Opening ChatGPT...")
     webbrowser.get("firefox").open_new_tab("https://chat.openai.com/")
     found = focus_and_click_chatgpt_input(timeout=5)
@@ -226,6 +598,15 @@ def send_to_new_chatgpt(text):
         print("⚠️ Input box not detected, you can paste manually.")
 
 
+def get_llm_client():
+    global _llm_client
+    if _llm_client is None:
+        from llm_client import OllamaClient
+
+        _llm_client = OllamaClient(OLLAMA_URL, OLLAMA_MODEL)
+    return _llm_client
+
+
 def call_llm(text):
     prompt = f"""You are a helpful assistant. Please:
 1. Re-punctuate the text below correctly.
@@ -235,61 +616,38 @@ def call_llm(text):
 Text:
 {text}
 """
-    payload = {
-        "model": OLLAMA_MODEL,
-        "prompt": prompt,
-        "stream": False
-    }
-    print("🤖 Calling local LLM...")
-    try:
-        res = requests.post(OLLAMA_URL, json=payload)
-        raw = res.json().get("response", "{}")
-        data = json.loads(raw.split("```json")[-1].split("```")[0].strip()) if "```" in raw else json.loads(raw)
-        return data.get("punctuated_text", text), data.get("suggested_filename")
-    except Exception as e:
-        print(f"⚠️ LLM error: {e}")
-        return text, None
-
-
-def handle_key_input_during_recording():
-    global action_chosen, recording
-
-    def on_press(key):
-        global action_chosen, recording
-        key_map = {'1': 1, '2': 2, '3': 3, '4': 4, '5': 5}
-        if hasattr(key, 'char') and key.char in key_map:
-            action_chosen = key_map[key.char]
-            recording = False
-        elif hasattr(key, 'vk') and key.vk in {97: 1, 98: 2, 99: 3, 100: 4, 101: 5, 53: 5, 229: 5}:
-            action_chosen = {97: 1, 98: 2, 99: 3, 100: 4, 101: 5, 53: 5, 229: 5}[key.vk]
-            recording = False
-
-    listener = pynput_keyboard.Listener(on_press=on_press)
-    listener.start()
-    while recording:
-        time.sleep(0.05)
-    listener.stop()
-
+    from llm_client import JsonFieldStreamer
 
-def handle_escape_during_recording():
-    """Wait for Escape key to stop recording in quick mode."""
-    global recording
+    print("🤖 Calling local LLM...")
+    print("\n✨ Enhanced Text:\n")
+    streamed = []
 
-    def on_press(key):
-        global recording
-        if key == pynput_keyboard.Key.esc:
-            recording = False
+    def show(chunk):
+        streamed.append(chunk)
+        print(chunk, end="", flush=True)
 
-    listener = pynput_keyboard.Listener(on_press=on_press)
-    listener.start()
-    while recording:
-        time.sleep(0.05)
-    listener.stop()
+    # Show the punctuated text while it is generated
+    streamer = JsonFieldStreamer("punctuated_text", show)
+    try:
+        data = get_llm_client().generate_json(prompt, on_token=streamer.feed)
+        new_text, new_name = data.get("punctuated_text", text), data.get("suggested_filename")
+        failed = False
+    except Exception as e:
+        print(f"\n⚠️ LLM error: {e}")
+        new_text, new_name = text, None
+        failed = True
+    if streamed and not failed:
+        print()
+    else:
+        print(new_text)  # nothing (or only part of it) was streamed
+    return new_text, new_name
 
 
-def paste_at_cursor_and_send(text, target_window=None):
+def paste_at_cursor_and_send(text, target_window=None, model_size=None):
     """Paste text at current cursor position and press Enter."""
-    text_with_disclaimer = QUICK_MODE_DISCLAIMER + text
+    import pyautogui
+
+    text_with_disclaimer = QUICK_MODE_DISCLAIMER.format(model=model_size or MODEL_SIZE) + text
     pyperclip.copy(text_with_disclaimer)
 
     # Refocus original window if provided
@@ -305,11 +663,11 @@ def paste_at_cursor_and_send(text, target_window=None):
     print("📨 Pasted and sent.")
 
 
-def post_transcription_menu(text):
-    global action_chosen, current_audio_path, current_transcript_path
+def post_transcription_menu(session, text):
     print("\n📄 Transcription:\n")
     print(text)
     print()
+    action_chosen = session.action
     if action_chosen is None:
         print("\nWhat would you like to do?")
         print("1. Show transcription (default)")
@@ -320,54 +678,210 @@ def post_transcription_menu(text):
         choice = input("Choose (1–5): ").strip()
         action_chosen = int(choice) if choice in '12345' else 1
 
+    trace = session.trace
     if action_chosen == 2:
-        send_to_existing_chatgpt(text)
+        with trace.span("chatgpt_send", tab="existing"):
+            send_to_existing_chatgpt(text)
     elif action_chosen == 3:
-        send_to_new_chatgpt(text)
+        with trace.span("chatgpt_send", tab="new"):
+            send_to_new_chatgpt(text)
     elif action_chosen == 4:
-        new_text, new_name = call_llm(text)
-        print("\n✨ Enhanced Text:\n")
-        print(new_text)
+        with trace.span("llm", model=OLLAMA_MODEL):
+            new_text, new_name = call_llm(text)
         pyperclip.copy(new_text)
         print("📋 Copied enhanced version to clipboard.")
         playsound("sounds/plop.wav")
         if new_name:
-            folder = os.path.dirname(current_audio_path)
+            settle_refinement(session)
+            wait_for_pending_saves()
+            folder = os.path.dirname(session.audio_path)
             base = os.path.dirname(folder)
             renamed = os.path.join(base, f"{os.path.basename(folder)}_{new_name}")
             os.rename(folder, renamed)
+            session.audio_path = os.path.join(renamed, os.path.basename(session.audio_path))
+            session.transcript_path = os.path.join(renamed, os.path.basename(session.transcript_path))
+            trace.move(renamed)
             print(f"📁 Folder renamed to: {renamed}")
+            try:
+                recordings_index.rename_recording(folder, renamed)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not update the recordings index: {e}")
     elif action_chosen == 5:
         print("❌ Discarded.")
+        settle_refinement(session, cancel=True)
+        wait_for_pending_saves()
+        folder = os.path.dirname(session.audio_path)
+        for fmt in ARCHIVE_FORMATS:
+            if os.path.exists(os.path.join(folder, audio_filename(fmt))):
+                os.remove(os.path.join(folder, audio_filename(fmt)))
         try:
-            os.remove(current_audio_path)
-            os.remove(current_transcript_path)
+            os.remove(session.transcript_path)
+            os.remove(jsonl_path_for(session.transcript_path))
         except FileNotFoundError:
             pass
+        try:
+            recordings_index.remove_recording(os.path.dirname(session.transcript_path))
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not update the recordings index: {e}")
     else:
         pass  # Default action is to show transcription and exit
 
 
-def main():
-    global recording
+def pop_option(args, flag):
+    """Remove `flag <value>` from args and return the value (None if absent)."""
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    value = args[idx + 1] if idx + 1 < len(args) else None
+    del args[idx:idx + 2]
+    return value
 
-    # Parse arguments
-    quick_mode = "--quick" in sys.argv
-    target_window = None
-    if "--target-window" in sys.argv:
-        idx = sys.argv.index("--target-window")
-        if idx + 1 < len(sys.argv):
-            target_window = sys.argv[idx + 1]
 
-    args = [a for a in sys.argv[1:] if a not in ["--quick", "--target-window", target_window or ""]]
+def transcribe_batch(target, workers=None, replicas=1, use_cache=True, jsonl=False):
+    paths = discover_audio_files(target, SUPPORTED_AUDIO_EXTENSIONS)
+    if not paths:
+        print(f"❌ No supported audio files found in: {target}")
+        print(f"   Supported: {', '.join(sorted(SUPPORTED_AUDIO_EXTENSIONS))}")
+        return
+    print(f"📂 Batch transcribing {len(paths)} files...")
+    init_profile()
+    if replicas > 1:
+        # Several threads share one model instance with `replicas` CTranslate2 workers
+        model = load_model(num_workers=replicas)
+        decode_fn = model.transcribe
+    else:
+        decode_fn = partial(run_transcription, priority="batch")
+
+    def transcribe_fn(audio):
+        if use_cache:
+            segments, info, _ = cached_transcribe(audio, decode_fn, MODEL_SIZE, COMPUTE_TYPE)
+            return segments, info
+        return decode_fn(audio, beam_size=1, best_of=1)
+
+    run_batch(paths, transcribe_fn, SAMPLE_RATE, workers=workers, replicas=replicas, jsonl=jsonl,
+              normalize=PREPROCESS_NORMALIZE, highpass_hz=PREPROCESS_HIGHPASS_HZ)
+
+
+def report_daemon_busy(error, audio_path):
+    """On a GPU a busy daemon is not replaced by a local model: say when to retry and with what."""
+    print(f"⏳ Transcription daemon still busy, try again in ~{error.retry_after:.0f}s.")
+    print(f"💾 Audio kept at {audio_path}, transcribe it later with:")
+    print(f"   python3 voice_transcriber.py {audio_path}")
+
+
+def run_quick_recording(target_window=None, streaming=STREAM_WHILE_RECORDING, jsonl=False, draft=DRAFT_MODE,
+                        session=None):
+    """Quick mode: Escape (or session.stop()) ends recording, then paste at cursor. Returns the text."""
+    session = session or RecordingSession("quick")
+    streaming = streaming and not draft  # the draft model decodes the whole recording at once
+    filename = generate_paths(session)
+    streamer = StreamingTranscriber(run_transcription, SAMPLE_RATE, trim=TRIM_SILENCE) if streaming else None
+    recorder_thread = threading.Thread(target=record_audio, args=(session, filename, True, streamer))
+    recorder_thread.start()  # open the microphone first; pynput and the model load meanwhile
+    listener = start_key_listener(session.stop_on_escape)
+    start_warm_up(quick_mode=True, draft=draft)
+    recorder_thread.join()
+    listener.stop()
+
+    if session.recorder is not None and session.recorder.frames_recorded:
+        model_size = DRAFT_MODEL_SIZE if draft else None
+        try:
+            return transcribe_audio(session, session.recorder.get_audio(), streamer, jsonl=jsonl, draft=draft,
+                                    on_text_ready=lambda text: paste_at_cursor_and_send(text, target_window,
+                                                                                        model_size))
+        except DaemonBusy as e:
+            report_daemon_busy(e, session.audio_path)
+    return None
+
+
+def run_interactive_recording(streaming=STREAM_WHILE_RECORDING, jsonl=False, draft=DRAFT_MODE, session=None):
+    """Default mode: 1-5 keys (or session.stop(action)) end recording and choose the action. Returns the text."""
+    session = session or RecordingSession("interactive")
+    streaming = streaming and not draft
+    filename = generate_paths(session)
+    streamer = StreamingTranscriber(run_transcription, SAMPLE_RATE, trim=TRIM_SILENCE) if streaming else None
+    recorder_thread = threading.Thread(target=record_audio, args=(session, filename, False, streamer))
+    recorder_thread.start()
+    listener = start_key_listener(session.stop_on_action_key)
+    start_warm_up(draft=draft)
+    recorder_thread.join()
+    listener.stop()
+
+    if session.recorder is None or not session.recorder.frames_recorded:
+        return None
+    if session.action == 5:
+        if streamer:
+            streamer.cancel()
+        print("❌ Aborted before transcription.")
+        return None
+    if session.action == 4:
+        # Load the LLM while Whisper is busy so it is ready when the text is
+        threading.Thread(target=get_llm_client().warm_up, daemon=True).start()
+    try:
+        text = transcribe_audio(session, session.recorder.get_audio(), streamer, jsonl=jsonl, draft=draft)
+    except DaemonBusy as e:
+        report_daemon_busy(e, session.audio_path)
+        return None
+    post_transcription_menu(session, text)
+    return text
+
+
+def main():
+    # Parse arguments
+    args = sys.argv[1:]
+    search_query = None
+    if "--search" in args:
+        # Everything after --search is the query, quoted or not (as in recordings_index.py)
+        idx = args.index("--search")
+        search_query = " ".join(args[idx + 1:])
+        del args[idx:]
+    quick_mode = "--quick" in args
+    streaming = STREAM_WHILE_RECORDING and "--no-stream" not in args
+    use_cache = "--no-cache" not in args
+    jsonl = "--jsonl" in args
+    draft = DRAFT_MODE or "--draft" in args
+    type_text = "--type" in args
+    target_window = pop_option(args, "--target-window")
+    batch_target = pop_option(args, "--batch")
+    workers = pop_option(args, "--workers")
+    hotkey_time = pop_option(args, "--hotkey-time")
+    replicas = pop_option(args, "--replicas")
+    reindex = "--reindex" in args
+    args = [a for a in args if a not in ["--quick", "--no-stream", "--no-cache", "--jsonl", "--type", "--reindex", "--draft"]]
 
     if len(args) > 1 or (len(args) == 1 and args[0] in ["--help", "-h"]):
         print_help()
         return
 
+    # Archive search
+    if search_query is not None:
+        if not search_query.strip():
+            print_help()
+            return
+        recordings_index.print_results(search_query, recordings_index.search(search_query))
+        return
+    if reindex:
+        start = time.time()
+        updated, removed, total = recordings_index.rebuild()
+        print(f"✅ Index synced in {time.time() - start:.1f}s: {total} recordings, "
+              f"{updated} (re)indexed, {removed} removed")
+        return
+
+    # Batch mode
+    if batch_target:
+        transcribe_batch(batch_target, int(workers) if workers else None, int(replicas) if replicas else 1, use_cache,
+                         jsonl)
+        return
+
+    mode = "file" if len(args) == 1 else ("quick" if quick_mode else "interactive")
+    session = RecordingSession(mode, float(hotkey_time) if hotkey_time else None)
+
     # File transcription mode
     if len(args) == 1:
         input_file = args[0]
+        if os.path.isdir(input_file):
+            # A recordings/ folder: use whichever copy the archive kept (WAV, FLAC or Opus)
+            input_file = find_recording_audio(input_file) or input_file
         if not os.path.isfile(input_file):
             print(f"❌ File not found: {input_file}")
             return
@@ -377,46 +891,29 @@ def main():
             print(f"   Supported: {', '.join(sorted(SUPPORTED_AUDIO_EXTENSIONS))}")
             return
         print(f"📂 Transcribing {ext} file...")
-        generate_paths()
-        text = transcribe_audio(input_file)
-        if quick_mode:
-            paste_at_cursor_and_send(text, target_window)
-        else:
-            post_transcription_menu(text)
+        generate_paths(session)
+        try:
+            if quick_mode:
+                transcribe_audio(session, input_file, use_cache=use_cache, jsonl=jsonl,
+                                 workers=int(workers) if workers else None,
+                                 on_text_ready=lambda text: paste_at_cursor_and_send(text, target_window))
+            else:
+                text = transcribe_audio(session, input_file, use_cache=use_cache, jsonl=jsonl, type_text=type_text,
+                                        workers=int(workers) if workers else None)
+                post_transcription_menu(session, text)
+        except DaemonBusy as e:
+            report_daemon_busy(e, input_file)
         return
 
     # Recording mode
-    filename = generate_paths()
-
     if quick_mode:
-        # Quick mode: Escape to stop, then paste at cursor
-        recording = True
-        recorder = threading.Thread(target=record_audio, args=(filename, True))
-        escape_listener = threading.Thread(target=handle_escape_during_recording)
-        recorder.start()
-        escape_listener.start()
-        recorder.join()
-        escape_listener.join()
-
-        if os.path.exists(filename):
-            text = transcribe_audio(filename)
-            paste_at_cursor_and_send(text, target_window)
+        run_quick_recording(target_window, streaming, jsonl, draft, session)
     else:
-        # Default mode: 1-5 keys to choose action
-        recorder = threading.Thread(target=record_audio, args=(filename,))
-        hotkeys = threading.Thread(target=handle_key_input_during_recording)
-        recorder.start()
-        hotkeys.start()
-        recorder.join()
-        hotkeys.join()
-
-        if os.path.exists(filename):
-            if action_chosen == 5:
-                print("❌ Aborted before transcription.")
-                return
-            text = transcribe_audio(filename)
-            post_transcription_menu(text)
+        run_interactive_recording(streaming, jsonl, draft, session)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        wait_for_background()